@@ -0,0 +1,173 @@
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 🌌 PROJECT: HARPIA GEOMETRY ENGINE [BLOCK DATASET]
+# 🧱 OBJECT: Layout em bloco único [frames, qubits, 3] + escalares por frame
+# 🐝 MODO: Enxames grandes (1k–100k qubits) sem pandas no caminho quente
+# ⚡ ENGINE: .npy memmap (escrita em lotes, leitura sob demanda)
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 👤 AUTHOR: Deywe Okabe & Gemini
+# 🛠️ VERSION: 1.0.0 "Swarm Monolith"
+# ─────────────────────────────────────────────────────────────────────────────────────────
+import json
+import os
+import time
+
+import numpy as np
+
+# Estrutura do diretório <nome>.harpia/
+#   posicoes.npy  : float32 [frames, qubits, 3]  (eixos do CSV: x, y, z)
+#   escalares.npy : float64 [frames, n_escalares]
+#   meta.json     : n_qubits, total_frames, escalares, + metadados do engine
+EXTENSAO_BLOCO = '.harpia'
+ESCALARES_BLOCO = ['T', 'Caos_Global', 'VR_Gain_Avg', 'Quantum_Flux']
+
+def e_bloco(caminho):
+    return os.path.isdir(caminho) and os.path.isfile(os.path.join(caminho, 'meta.json'))
+
+# ==================================================================================
+# MÓDULO I: ESCRITA
+# ==================================================================================
+
+class EscritorBloco:
+    """
+    Escreve o dataset em lotes de frames direto nos memmaps (memória limitada
+    ao lote, independente do total de frames).
+    """
+    def __init__(self, caminho, total_frames, n_qubits, nomes_escalares=ESCALARES_BLOCO,
+                 meta=None):
+        os.makedirs(caminho, exist_ok=True)
+        self.caminho = caminho
+        self.nomes_escalares = list(nomes_escalares)
+        self.meta = dict(meta or {})
+        self.meta.update({'n_qubits': n_qubits, 'total_frames': total_frames,
+                          'escalares': self.nomes_escalares})
+        self.posicoes = np.lib.format.open_memmap(
+            os.path.join(caminho, 'posicoes.npy'), mode='w+', dtype=np.float32,
+            shape=(total_frames, n_qubits, 3))
+        self.escalares = np.lib.format.open_memmap(
+            os.path.join(caminho, 'escalares.npy'), mode='w+', dtype=np.float64,
+            shape=(total_frames, len(self.nomes_escalares)))
+
+    def escrever(self, ini, posicoes, escalares):
+        fim = ini + len(posicoes)
+        self.posicoes[ini:fim] = posicoes
+        for j, nome in enumerate(self.nomes_escalares):
+            self.escalares[ini:fim, j] = escalares[nome]
+
+    def fechar(self):
+        self.posicoes.flush()
+        self.escalares.flush()
+        del self.posicoes, self.escalares
+        with open(os.path.join(self.caminho, 'meta.json'), 'w') as f:
+            json.dump(self.meta, f, indent=2)
+
+# Células [frame, qubit] por lote. O núcleo mantém ~30 grids float64 vivas, então
+# ~1M células dá pico de ~400 MB de RSS (com 4M passava de 1 GB em 100k qubits)
+CELULAS_POR_LOTE = 1 << 20
+
+def frames_por_lote(n_qubits, elementos=CELULAS_POR_LOTE):
+    return max(elementos // max(n_qubits, 1), 1)
+
+def gerar_bloco(caminho, avaliar, total_frames, n_qubits, lote=None, meta=None):
+    """
+    Gera o dataset em bloco chamando `avaliar(indices)` (núcleo Akashic de
+    acesso aleatório) lote a lote. Retorna as estatísticas agregadas.
+    """
+    lote = lote or frames_por_lote(n_qubits)
+    escritor = EscritorBloco(caminho, total_frames, n_qubits, meta=meta)
+    soma_coerencia = 0.0
+    resets_fenix = 0.0
+    for ini in range(0, total_frames, lote):
+        campo = avaliar(np.arange(ini, min(ini + lote, total_frames)))
+        escritor.escrever(ini, campo['posicoes'], campo)
+        soma_coerencia += float(np.sum(campo['S_local']))
+        resets_fenix += campo['resets_fenix']
+    escritor.fechar()
+    return {'resets_fenix': resets_fenix,
+            'coerencia_media': soma_coerencia / (total_frames * n_qubits)}
+
+# ==================================================================================
+# MÓDULO II: LEITURA
+# ==================================================================================
+
+class DatasetBloco:
+    """
+    Dataset em bloco aberto via memmap: `posicoes[frame]` já é o data_matrix
+    dos players, sem reconstrução coluna a coluna.
+    """
+    def __init__(self, caminho, mmap=True):
+        self.caminho = caminho
+        with open(os.path.join(caminho, 'meta.json')) as f:
+            self.meta = json.load(f)
+        modo = 'r' if mmap else None
+        self.posicoes = np.load(os.path.join(caminho, 'posicoes.npy'), mmap_mode=modo)
+        tabela = np.load(os.path.join(caminho, 'escalares.npy'), mmap_mode=modo)
+        self.escalares = {nome: tabela[:, j] for j, nome in enumerate(self.meta['escalares'])}
+        self.total_frames, self.n_qubits, _ = self.posicoes.shape
+
+    def visao_longa(self, ini=0, fim=None, com_escalares=False):
+        """
+        Visão tidy (uma linha por frame x qubit) para análise com pandas.
+        """
+        import pandas as pd
+        fim = self.total_frames if fim is None else min(fim, self.total_frames)
+        pos = np.asarray(self.posicoes[ini:fim])
+        n = fim - ini
+        dados = {
+            'Frame': np.repeat(np.arange(ini, fim), self.n_qubits),
+            'Qubit': np.tile(np.arange(self.n_qubits), n),
+            'x': pos[..., 0].ravel(), 'y': pos[..., 1].ravel(), 'z': pos[..., 2].ravel(),
+        }
+        if com_escalares:
+            for nome, valores in self.escalares.items():
+                dados[nome] = np.repeat(np.asarray(valores[ini:fim]), self.n_qubits)
+        return pd.DataFrame(dados)
+
+def carregar_bloco(caminho, mmap=True):
+    return DatasetBloco(caminho, mmap)
+
+# ==================================================================================
+# MÓDULO III: BENCHMARK DE ESCALA (1k – 100k QUBITS)
+# ==================================================================================
+
+def medir_escala(avaliar_por_qubits, destino, tamanhos=(1000, 10000, 100000), total_frames=200,
+                 comparar_colunas_ate=10000):
+    """
+    Compara, para cada tamanho de enxame, o layout em bloco (geração + leitura
+    via memmap) com o layout legado de 3·n colunas (dict -> DataFrame -> loop
+    de reconstrução do data_matrix nos players).
+    """
+    import pandas as pd
+    resultados = []
+    for n in tamanhos:
+        avaliar = avaliar_por_qubits(n)
+        caminho = os.path.join(destino, f'bench_{n}q{EXTENSAO_BLOCO}')
+
+        t0 = time.perf_counter()
+        gerar_bloco(caminho, avaliar, total_frames, n)
+        t_gerar = time.perf_counter() - t0
+
+        # Leitura completa para a RAM (o memmap sozinho não lê nada)
+        t0 = time.perf_counter()
+        data_matrix = np.array(carregar_bloco(caminho).posicoes)
+        t_ler = time.perf_counter() - t0
+
+        linha = {'qubits': n, 'frames': total_frames, 'bloco_gerar_s': t_gerar,
+                 'bloco_ler_s': t_ler, 'bloco_mb': data_matrix.nbytes / 1e6}
+
+        if n <= comparar_colunas_ate:
+            t0 = time.perf_counter()
+            campo = avaliar(np.arange(total_frames))
+            data_dict = {'Frame': campo['frames']}
+            for i in range(n):
+                data_dict[f'q{i}_x'] = campo['posicoes'][:, i, 0]
+                data_dict[f'q{i}_y'] = campo['posicoes'][:, i, 1]
+                data_dict[f'q{i}_z'] = campo['posicoes'][:, i, 2]
+            df = pd.DataFrame(data_dict)
+            matriz = np.zeros((total_frames, n, 3))
+            for q in range(n):
+                matriz[:, q, 0] = df[f'q{q}_x'].values
+                matriz[:, q, 1] = df[f'q{q}_y'].values
+                matriz[:, q, 2] = df[f'q{q}_z'].values
+            linha['colunas_s'] = time.perf_counter() - t0
+        resultados.append(linha)
+    return resultados
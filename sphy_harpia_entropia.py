@@ -0,0 +1,47 @@
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 🌌 PROJECT: HARPIA GEOMETRY ENGINE [COUNTER ENTROPY]
+# 🎲 OBJECT: RNG por contador compartilhado pelos engines (cubo, pirâmide, enxame)
+# 🔁 MODO: Acesso aleatório — o valor de (semente, frame, qubit) não depende da ordem
+# ⚡ ENGINE: SplitMix64 vetorizado (NumPy uint64)
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 👤 AUTHOR: Deywe Okabe & Gemini
+# 🛠️ VERSION: 1.0.0 "Akashic Dice"
+# ─────────────────────────────────────────────────────────────────────────────────────────
+import numpy as np
+
+# Módulo único de propósito: a reprodutibilidade por semente depende de todos os
+# engines usarem exatamente esta sequência.
+
+def _splitmix64(x):
+    # Mistura SplitMix64 (aritmética uint64 com wraparound)
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def uniforme_contador(semente, frames, n_qubits):
+    """
+    U[0, 1) chaveado por (semente, frame, qubit), sem estado sequencial:
+    o valor de um frame não depende de nenhum frame gerado antes dele.
+    """
+    chave = _splitmix64(np.array([semente], dtype=np.uint64))
+    f = np.asarray(frames, dtype=np.uint64)[:, np.newaxis]
+    q = np.arange(n_qubits, dtype=np.uint64)[np.newaxis, :]
+    x = _splitmix64(_splitmix64(f ^ chave) + q)
+    return (x >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+def nova_semente():
+    return int(np.random.randint(0, 2**63 - 1, dtype=np.int64))
+
+def validar_frames(frames, total_frames):
+    """
+    Índices de frame como vetor int64 em [0, total_frames). Fora da faixa o
+    valor não pertence a nenhuma execução completa (-1 daria wraparound no
+    uint64 e >= total_frames extrapolaria a rampa de caos).
+    """
+    frames = np.atleast_1d(np.asarray(frames, dtype=np.int64))
+    if frames.ndim != 1:
+        raise ValueError(f"Índices de frame devem ser 1D (recebido {frames.shape})")
+    if len(frames) and (frames.min() < 0 or frames.max() >= total_frames):
+        raise ValueError(f"Índices de frame fora de [0, {total_frames})")
+    return frames
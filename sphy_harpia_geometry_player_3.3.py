@@ -4,9 +4,12 @@
 # ─────────────────────────────────────────────────────────────────────────────
 from ursina import *
 from ursina.prefabs.trail_renderer import TrailRenderer
-import pandas as pd
 import numpy as np
 import sys
+from panda3d.core import Point2, Point3
+from sphy_harpia_stream_server import carregar_telemetria
+from sphy_harpia_bloco import carregar_bloco, e_bloco
+from sphy_harpia_spatial_index import indice_para_dataset
 
 # 1. CONFIGURAÇÃO DA JANELA
 app = Ursina(title='Harpia Quantum Cube', vsync=True, show_fps=True)
@@ -15,25 +18,53 @@ window.size = (1536, 864)
 window.borderless = False
 
 # 2. CARREGAMENTO DE DADOS
-csv_file = 'dataset_cubo_turbo_5000frames.csv'
+# Fonte: CSV local, dataset em bloco (.harpia) ou servidor remoto (ex.: tcp://192.168.0.10:8765)
+csv_file = sys.argv[1] if len(sys.argv) > 1 else 'dataset_cubo_turbo_5000frames.csv'
 print(f"⚡ Lendo Telemetria do Cubo: {csv_file}...")
 
+n_qubits = 8 # Essencial ser 8 para um cubo
+
 try:
-    df = pd.read_csv(csv_file)
+    bloco = carregar_bloco(csv_file) if e_bloco(csv_file) else None
+    if bloco is None:
+        frame_ids, escalares, data_matrix = carregar_telemetria(csv_file, n_qubits)
 except FileNotFoundError:
     print(f"❌ Erro: Arquivo {csv_file} não encontrado.")
     sys.exit()
+except (ConnectionError, OSError):
+    print(f"❌ Erro: Servidor {csv_file} inacessível.")
+    sys.exit()
+except ValueError as erro:
+    # Ex.: fonte ao vivo sem ?frames=N
+    print(f"❌ Erro: {erro}")
+    sys.exit()
 
-total_frames = df['Frame'].max() + 1
-n_qubits = 8 # Essencial ser 8 para um cubo
+# Fontes remotas podem começar em qualquer frame (tcp://...?inicio=N&frames=M)
+total_frames = bloco.total_frames if bloco is not None else len(frame_ids)
 print(f"✅ Matrix Carregada: {total_frames} Frames.")
 
-# Conversão para Matriz Numpy
-data_matrix = np.zeros((total_frames, n_qubits, 3))
-for q in range(n_qubits):
-    data_matrix[:, q, 0] = df[f'q{q}_x'].values
-    data_matrix[:, q, 1] = df[f'q{q}_y'].values
-    data_matrix[:, q, 2] = df[f'q{q}_z'].values
+if bloco is not None:
+    # Dataset em bloco: o memmap [frames, qubits, 3] já é o data_matrix
+    data_matrix = bloco.posicoes
+    frame_ids = np.arange(total_frames)
+    vr_gains = bloco.escalares['VR_Gain_Avg']
+else:
+    vr_gains = escalares['VR_Gain_Avg']
+
+# Índice espacial (salvo ao lado do dataset): picking do qubit sob o cursor
+indice = indice_para_dataset(csv_file, data_matrix)
+
+def raio_cursor():
+    """
+    Raio câmera -> cursor no espaço do dataset (Ursina Y-UP -> CSV Z-UP).
+    """
+    perto, longe = Point3(), Point3()
+    camera.lens.extrude(Point2(mouse.x * 2 / window.aspect_ratio, mouse.y * 2), perto, longe)
+    perto = scene.getRelativePoint(camera, perto)
+    longe = scene.getRelativePoint(camera, longe)
+    origem = np.array([perto[0], perto[2], perto[1]])
+    direcao = np.array([longe[0] - perto[0], longe[2] - perto[2], longe[1] - perto[1]])
+    return origem, direcao
 
 # 3. CENÁRIO (Campo Toroidal Minimalista)
 print("🏟️  Gerando Palco...")
@@ -74,6 +105,7 @@ camera_angle = 0
 # HUD Limpo
 Text(text='QUANTUM SOVEREIGN CUBE', position=(-0.85, 0.45), scale=1.2, color=color.cyan)
 status_bar = Text(text='GEOMETRY: STABLE', position=(-0.85, 0.40), scale=0.9, color=color.lime)
+pick_bar = Text(text='', position=(-0.85, 0.36), scale=0.9, color=color.white)
 
 def update():
     global current_frame, camera_angle
@@ -102,6 +134,13 @@ def update():
         
         verts_for_lines.append(target)
 
+    # Picking: qubit sob o cursor (índice espacial, independe do nº de frames)
+    origem, direcao = raio_cursor()
+    # Esfera da Ursina tem diâmetro 1 na escala 1: raio = scale / 2 (com a pulsação)
+    raios = np.array([s.scale_x for s in qubit_spheres]) / 2
+    qubit, _ = indice.pick(idx, origem, direcao, raio_pick=raios)
+    pick_bar.text = f'QUBIT: q{qubit}' if qubit is not None else ''
+
     # --- AQUI ESTÁ A MÁGICA DO CUBO PURO ---
     # Definimos EXATAMENTE as 12 arestas de um cubo.
     # Assumindo que 0-3 é a base e 4-7 é o topo.
@@ -136,8 +175,8 @@ def update():
     
     # HUD Update
     try:
-        vr_gain = df["VR_Gain_Avg"][idx]
-        status_bar.text = f'FRAME: {idx} | SYNC: {vr_gain:.4f}'
+        vr_gain = vr_gains[idx]
+        status_bar.text = f'FRAME: {frame_ids[idx]} | SYNC: {vr_gain:.4f}'
     except:
         pass
 
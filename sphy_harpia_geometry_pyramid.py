@@ -13,6 +13,8 @@ from tqdm import tqdm
 import sys
 import hashlib
 import time
+from sphy_harpia_bloco import gerar_bloco, EXTENSAO_BLOCO
+from sphy_harpia_entropia import uniforme_contador, nova_semente, validar_frames
 
 # 1. VERIFICAÇÃO DE DEPENDÊNCIAS
 # --- PENNYLANE ---
@@ -82,12 +84,15 @@ def coerencia_ethereal_vectorized(f_matrix, zeta_base, ruido_local, r_toro_base)
     
     return fase_vibracional, distorcao, s_coerencia
 
-def processar_frames_akashic(n_qubits, total_frames, R_TORO, r_TORO, F_ACHAT, habilitar_vr=True):
-    print(f"\n⚙️  Iniciando Motor Akashic (Pyramid Topology) para {total_frames} frames...")
-    start_time = time.perf_counter()
-
+def avaliar_frames_akashic(frames, n_qubits, total_frames, R_TORO, r_TORO, F_ACHAT, semente,
+                           habilitar_vr=True):
+    """
+    Núcleo Akashic para um conjunto ARBITRÁRIO de frames (acesso aleatório).
+    Cada frame depende apenas do seu índice, de total_frames e da semente,
+    então qualquer subconjunto reproduz exatamente os valores da execução completa.
+    """
     # 1. GRIDS
-    frames = np.arange(total_frames)
+    frames = validar_frames(frames, total_frames)
     qubits = np.arange(n_qubits)
     t_values = frames * 0.05
     
@@ -95,7 +100,6 @@ def processar_frames_akashic(n_qubits, total_frames, R_TORO, r_TORO, F_ACHAT, ha
     T_grid = F_grid * 0.05
     
     # 2. ORÁCULO PENNYLANE
-    print("⚛️  Executando Circuito Soberano (QPU)...")
     fluxo_t = gerar_fluxo_quantico_akashic(t_values)
     Fluxo_grid = np.tile(fluxo_t[:, np.newaxis], (1, n_qubits)) 
 
@@ -108,7 +112,8 @@ def processar_frames_akashic(n_qubits, total_frames, R_TORO, r_TORO, F_ACHAT, ha
     
     mask_vibra = (F_grid > (total_frames * 0.1)) & (F_grid < (total_frames * 0.5))
     Ruido_vibra_grid = np.where(mask_vibra, 0.35 * np.sin(F_grid * 0.4), 0.0)
-    P_singular_grid = np.random.uniform(0, 1, size=(total_frames, n_qubits)) * (Caos_estabilizado_grid * 0.1)
+    # Entropia por contador: substitui o sorteio sequencial np.random.uniform
+    P_singular_grid = uniforme_contador(semente, frames, n_qubits) * (Caos_estabilizado_grid * 0.1)
 
     # 4. ENGINE VR
     if habilitar_vr:
@@ -121,8 +126,6 @@ def processar_frames_akashic(n_qubits, total_frames, R_TORO, r_TORO, F_ACHAT, ha
     # 5. GEOMETRIA: AQUI ESTÁ A MUDANÇA PARA PIRÂMIDE
     if n_qubits == 4:
         # --- MAPEAMENTO TETRAÉDRICO (PIRÂMIDE) ---
-        print("🔺 Aplicando Topologia de Pirâmide Sagrada...")
-        
         # Qubit 0: Topo (Ápice) -> Theta = 90 graus (pi/2)
         # Qubits 1, 2, 3: Base -> Theta = -30 graus (aprox -pi/6)
         
@@ -133,16 +136,15 @@ def processar_frames_akashic(n_qubits, total_frames, R_TORO, r_TORO, F_ACHAT, ha
         zeta_base_arr = np.array([0.0, 0.0, 2*np.pi/3, 4*np.pi/3])
         
         # Broadcasting para o tempo
-        Theta_grid = np.tile(theta_base, (total_frames, 1)) + (T_grid * 0.1 * PHI) # Rotação lenta
-        Zeta_base_grid = np.tile(zeta_base_arr, (total_frames, 1))
+        Theta_grid = np.tile(theta_base, (len(frames), 1)) + (T_grid * 0.1 * PHI) # Rotação lenta
+        Zeta_base_grid = np.tile(zeta_base_arr, (len(frames), 1))
         
     elif n_qubits == 8:
         # Cubo (Backup caso decida mudar de volta)
-        print("🧊 Aplicando Topologia de Cubo Soberano...")
         theta_base = np.array([np.pi/4]*4 + [-np.pi/4]*4)
         zeta_base_arr = np.array([0, np.pi/2, np.pi, 3*np.pi/2] * 2)
-        Theta_grid = np.tile(theta_base, (total_frames, 1)) + (T_grid * 0.1 * PHI)
-        Zeta_base_grid = np.tile(zeta_base_arr, (total_frames, 1))
+        Theta_grid = np.tile(theta_base, (len(frames), 1)) + (T_grid * 0.1 * PHI)
+        Zeta_base_grid = np.tile(zeta_base_arr, (len(frames), 1))
     else:
         # Genérico (Anel)
         Offsets_grid = Q_grid * (2 * np.pi / n_qubits)
@@ -163,28 +165,56 @@ def processar_frames_akashic(n_qubits, total_frames, R_TORO, r_TORO, F_ACHAT, ha
     Y_grid = R_maior_efetivo * np.sin(Zeta_real)
     Z_grid = (R_din * F_ACHAT) * np.sin(Theta_grid)
 
+    return {
+        'frames': frames,
+        'T': t_values,
+        'Caos_Global': Caos_base_grid[:, 0],
+        'VR_Gain_Avg': np.mean(Ganho_grid, axis=1),
+        'Quantum_Flux': fluxo_t,
+        'posicoes': np.stack([X_grid, Y_grid, Z_grid], axis=-1),
+        'S_local': S_local,
+        'resets_fenix': resets_fenix,
+    }
+
+def processar_frames_akashic(n_qubits, total_frames, R_TORO, r_TORO, F_ACHAT, habilitar_vr=True,
+                             semente=None):
+    if semente is None:
+        semente = nova_semente()
+    print(f"\n⚙️  Iniciando Motor Akashic (Pyramid Topology) para {total_frames} frames...")
+    start_time = time.perf_counter()
+
+    print("⚛️  Executando Circuito Soberano (QPU)...")
+    if n_qubits == 4:
+        print("🔺 Aplicando Topologia de Pirâmide Sagrada...")
+    elif n_qubits == 8:
+        print("🧊 Aplicando Topologia de Cubo Soberano...")
+    campo = avaliar_frames_akashic(np.arange(total_frames), n_qubits, total_frames,
+                                   R_TORO, r_TORO, F_ACHAT, semente, habilitar_vr)
+
     # 6. PACKING
     print("📦 Organizando Telemetria (Packing)...")
     
     data_dict = {
-        'Frame': frames,
-        'T': t_values,
-        'Caos_Global': Caos_base_grid[:, 0],
-        'VR_Gain_Avg': np.mean(Ganho_grid, axis=1),
-        'Quantum_Flux': fluxo_t
+        'Frame': campo['frames'],
+        'T': campo['T'],
+        'Caos_Global': campo['Caos_Global'],
+        'VR_Gain_Avg': campo['VR_Gain_Avg'],
+        'Quantum_Flux': campo['Quantum_Flux']
     }
     
+    posicoes = campo['posicoes']
     for i in range(n_qubits):
-        data_dict[f'q{i}_x'] = X_grid[:, i]
-        data_dict[f'q{i}_y'] = Y_grid[:, i]
-        data_dict[f'q{i}_z'] = Z_grid[:, i]
+        data_dict[f'q{i}_x'] = posicoes[:, i, 0]
+        data_dict[f'q{i}_y'] = posicoes[:, i, 1]
+        data_dict[f'q{i}_z'] = posicoes[:, i, 2]
         
     df_sim = pd.DataFrame(data_dict)
     
     stats = {
-        'resets_fenix': resets_fenix,
-        'coerencia_media': np.mean(S_local),
-        'speed_fps': total_frames / (time.perf_counter() - start_time)
+        'resets_fenix': campo['resets_fenix'],
+        'coerencia_media': np.mean(campo['S_local']),
+        'speed_fps': total_frames / (time.perf_counter() - start_time),
+        'semente': semente
     }
     
     dt = time.perf_counter() - start_time
@@ -192,7 +222,7 @@ def processar_frames_akashic(n_qubits, total_frames, R_TORO, r_TORO, F_ACHAT, ha
     return df_sim, stats
 
 class Harpia_Pyramid_Engine:
-    def __init__(self):
+    def __init__(self, semente=None):
         # MUDANÇA PRINCIPAL: 4 QUBITS PARA TETRAEDRO
         self.n_qubits = 4 
         
@@ -201,6 +231,57 @@ class Harpia_Pyramid_Engine:
         self.r_TORUS = 9.9
         self.F_ACHAT = 1.0 
         
+        # Chave do RNG por contador: identifica a execução procedural
+        self.semente = nova_semente() if semente is None else semente
+        
+    def evaluate_frames(self, indices, total_frames):
+        """
+        Frames arbitrários da execução, sem gerar os anteriores.
+        Mesmos valores do generate_dataset com a mesma semente.
+        """
+        campo = avaliar_frames_akashic(
+            indices, 
+            self.n_qubits, 
+            total_frames, 
+            self.R_TORUS, 
+            self.r_TORUS, 
+            self.F_ACHAT, 
+            self.semente, 
+            habilitar_vr=VR_AVAILABLE
+        )
+        escalares = {k: campo[k] for k in ('T', 'Caos_Global', 'VR_Gain_Avg', 'Quantum_Flux')}
+        return campo['posicoes'], escalares
+        
+    def generate_block_dataset(self, total_frames, frames_por_lote=None):
+        """
+        Layout em bloco [frames, qubits, 3] + escalares (sem pandas), gerado em
+        lotes de frames via acesso aleatório (`frames_por_lote` limita a RAM).
+        """
+        output_dir = f"dataset_piramide_pennylane_{total_frames}frames{EXTENSAO_BLOCO}"
+        start_time = time.perf_counter()
+        stats = gerar_bloco(
+            output_dir, 
+            lambda indices: avaliar_frames_akashic(
+                indices, self.n_qubits, total_frames, self.R_TORUS, self.r_TORUS, 
+                self.F_ACHAT, self.semente, habilitar_vr=VR_AVAILABLE
+            ), 
+            total_frames, 
+            self.n_qubits, 
+            lote=frames_por_lote, 
+            meta={'engine': 'piramide', 'semente': self.semente}
+        )
+        dt = time.perf_counter() - start_time
+        
+        print("\n" + "🔺"*35)
+        print(f"✅ PYRAMID BLOCK DATASET COMPLETE.")
+        print(f"📦 Frames: {total_frames} | Qubits: {self.n_qubits}")
+        print(f"🚀 Speed: {total_frames / dt:.2f} frames/sec")
+        print(f"📊 Avg Coherence: {stats['coerencia_media']:.4f}")
+        print(f"🎲 Semente: {self.semente}")
+        print(f"📂 Dir: {output_dir}")
+        print("🔺"*35)
+        return output_dir
+        
     def generate_dataset(self, total_frames):
         df, stats = processar_frames_akashic(
             self.n_qubits, 
@@ -208,7 +289,8 @@ class Harpia_Pyramid_Engine:
             self.R_TORUS, 
             self.r_TORUS, 
             self.F_ACHAT, 
-            habilitar_vr=VR_AVAILABLE
+            habilitar_vr=VR_AVAILABLE,
+            semente=self.semente
         )
         
         # Nome atualizado para refletir a pirâmide
@@ -222,6 +304,7 @@ class Harpia_Pyramid_Engine:
         print(f"✅ PYRAMID DATASET GENERATION COMPLETE.")
         print(f"📦 Frames: {total_frames}")
         print(f"🚀 Speed: {stats['speed_fps']:.2f} frames/sec")
+        print(f"🎲 Semente: {stats['semente']}")
         print(f"🔐 SHA256: {file_hash[:16]}...")
         print(f"📂 File: {output_file}")
         print("🔺"*35)
@@ -0,0 +1,84 @@
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 🌌 PROJECT: HARPIA GEOMETRY ENGINE [SWARM EDITION]
+# 🐝 OBJECT: Enxame Quântico em Anel (1k – 100k Qubits)
+# 🏟️ STAGE: Spherical Horn Torus (R≈r)
+# ⚡ ENGINE: Núcleo Akashic (acesso aleatório) + Dataset em Bloco
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 👤 AUTHOR: Deywe Okabe & Gemini
+# 🛠️ VERSION: 1.0.0 "Hive Mind"
+# ─────────────────────────────────────────────────────────────────────────────────────────
+import sys
+import tempfile
+import time
+
+from sphy_harpia_geometry_n1_pl import avaliar_frames_akashic, VR_AVAILABLE
+from sphy_harpia_entropia import nova_semente
+from sphy_harpia_bloco import gerar_bloco, medir_escala, EXTENSAO_BLOCO
+
+class Harpia_Swarm_Engine:
+    def __init__(self, n_qubits=10000, semente=None):
+        # Topologia em anel: o núcleo do cubo troca para o mapeamento do cubo com 8 qubits
+        if n_qubits == 8:
+            raise ValueError("Enxame com 8 qubits seria o cubo: use Harpia_Geometry_Engine_Turbo")
+        self.n_qubits = n_qubits
+        # TORO ESFÉRICO (Horn Torus)
+        self.R_TORUS = 10.0
+        self.r_TORUS = 9.9
+        self.F_ACHAT = 1.0
+        self.semente = nova_semente() if semente is None else semente
+
+    def avaliador(self, total_frames):
+        """
+        Função indices -> campo do núcleo Akashic para esta execução.
+        """
+        return lambda indices: avaliar_frames_akashic(
+            indices, self.n_qubits, total_frames, self.R_TORUS, self.r_TORUS,
+            self.F_ACHAT, self.semente, habilitar_vr=VR_AVAILABLE
+        )
+
+    def evaluate_frames(self, indices, total_frames):
+        campo = self.avaliador(total_frames)(indices)
+        escalares = {k: campo[k] for k in ('T', 'Caos_Global', 'VR_Gain_Avg', 'Quantum_Flux')}
+        return campo['posicoes'], escalares
+
+    def generate_dataset(self, total_frames, frames_por_lote=None):
+        print(f"\n🐝 Enxame: {self.n_qubits} qubits x {total_frames} frames (layout em bloco)...")
+        output_dir = f"dataset_enxame_{self.n_qubits}q_{total_frames}frames{EXTENSAO_BLOCO}"
+        start_time = time.perf_counter()
+        stats = gerar_bloco(output_dir, self.avaliador(total_frames), total_frames, self.n_qubits,
+                            lote=frames_por_lote, meta={'engine': 'enxame', 'semente': self.semente})
+        dt = time.perf_counter() - start_time
+
+        print("\n" + "🐝"*35)
+        print(f"✅ SWARM DATASET GENERATION COMPLETE.")
+        print(f"📦 Frames: {total_frames} | Qubits: {self.n_qubits}")
+        print(f"🚀 Speed: {total_frames / dt:.2f} frames/sec")
+        print(f"📊 Avg Coherence: {stats['coerencia_media']:.4f}")
+        print(f"🎲 Semente: {self.semente}")
+        print(f"📂 Dir: {output_dir}")
+        print("🐝"*35)
+        return output_dir
+
+def benchmark_escala(total_frames=200, tamanhos=(1000, 10000, 100000)):
+    with tempfile.TemporaryDirectory() as destino:
+        resultados = medir_escala(
+            lambda n: Harpia_Swarm_Engine(n, semente=0).avaliador(total_frames),
+            destino, tamanhos, total_frames
+        )
+    print("\n📈 ESCALA: layout em bloco vs 3·n colunas (DataFrame + reconstrução)")
+    print(f"{'qubits':>8} | {'bloco gerar':>11} | {'bloco ler':>9} | {'MB':>8} | {'colunas':>9}")
+    for r in resultados:
+        colunas = f"{r['colunas_s']:.3f} s" if 'colunas_s' in r else '—'
+        print(f"{r['qubits']:>8} | {r['bloco_gerar_s']:>9.3f} s | {r['bloco_ler_s']:>7.3f} s "
+              f"| {r['bloco_mb']:>8.1f} | {colunas:>9}")
+    return resultados
+
+if __name__ == "__main__":
+    # Uso: python sphy_harpia_geometry_swarm.py [qubits] [frames] | bench [frames]
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark_escala(int(sys.argv[2]) if len(sys.argv) > 2 else 200)
+    else:
+        n_qubits = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+        total_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+        engine = Harpia_Swarm_Engine(n_qubits)
+        engine.generate_dataset(total_frames)
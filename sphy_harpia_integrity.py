@@ -0,0 +1,519 @@
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 🌌 PROJECT: HARPIA GEOMETRY ENGINE [INTEGRITY ANALYZER]
+# 📐 OBJECT: Validação quantitativa da rigidez do Cubo / Pirâmide
+# 🌊 MODO: Streaming em passagem única, memória O(1), resultados parciais mergeáveis
+# ⚡ ENGINE: NumPy em blocos + ProcessPool por faixa do arquivo
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 👤 AUTHOR: Deywe Okabe & Gemini
+# 🛠️ VERSION: 1.0.0 "Sacred Geometry Audit"
+# ─────────────────────────────────────────────────────────────────────────────────────────
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sphy_harpia_bloco import carregar_bloco, e_bloco
+
+ESCALARES_CORRELACAO = ['Caos_Global', 'VR_Gain_Avg', 'Quantum_Flux']
+
+# ==================================================================================
+# MÓDULO I: TOPOLOGIAS
+# ==================================================================================
+
+def topologia(n_qubits):
+    """
+    Arestas, tetraedros e faces quadradas da topologia de cada engine.
+    """
+    if n_qubits == 4:
+        # Pirâmide: Qubit 0 = Ápice, 1-3 = Base
+        arestas = [(1, 2), (2, 3), (3, 1), (0, 1), (0, 2), (0, 3)]
+        tetraedros = [(0, 1, 2, 3)]
+        faces = []
+    elif n_qubits == 8:
+        # Cubo: 0-3 = Base, 4-7 = Topo
+        arestas = [(0, 1), (1, 2), (2, 3), (3, 0),
+                   (4, 5), (5, 6), (6, 7), (7, 4),
+                   (0, 4), (1, 5), (2, 6), (3, 7)]
+        tetraedros = []
+        faces = [(0, 1, 2, 3), (4, 5, 6, 7),
+                 (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+    else:
+        # Anel genérico
+        arestas = [(i, (i + 1) % n_qubits) for i in range(n_qubits)]
+        tetraedros = []
+        faces = []
+    return {
+        'arestas': np.array(arestas, dtype=np.intp).reshape(-1, 2),
+        'tetraedros': np.array(tetraedros, dtype=np.intp).reshape(-1, 4),
+        'faces': np.array(faces, dtype=np.intp).reshape(-1, 4),
+    }
+
+def nomes_metricas(topo):
+    nomes = [f'aresta_{a}_{b}' for a, b in topo['arestas']]
+    nomes += ['volume_' + '_'.join(map(str, t)) for t in topo['tetraedros']]
+    nomes += ['planaridade_' + '_'.join(map(str, f)) for f in topo['faces']]
+    nomes += ['centroide_x', 'centroide_y', 'centroide_z', 'centroide_r']
+    return nomes
+
+def metricas_geometricas(posicoes, topo):
+    """
+    Métricas por frame de um bloco [frames, qubits, 3] -> [frames, n_metricas].
+    """
+    colunas = []
+
+    a, b = topo['arestas'].T
+    colunas.append(np.linalg.norm(posicoes[:, b] - posicoes[:, a], axis=-1))
+
+    if len(topo['tetraedros']):
+        p0, p1, p2, p3 = (posicoes[:, topo['tetraedros'][:, k]] for k in range(4))
+        produto_misto = np.einsum('...i,...i', p1 - p0, np.cross(p2 - p0, p3 - p0))
+        colunas.append(np.abs(produto_misto) / 6.0)
+
+    if len(topo['faces']):
+        # Quadrilátero plano: as diagonais geram o plano e (b - a) fica nele
+        pa, pb, pc, pd = (posicoes[:, topo['faces'][:, k]] for k in range(4))
+        normal = np.cross(pc - pa, pd - pb)
+        norma = np.linalg.norm(normal, axis=-1, keepdims=True)
+        normal = np.divide(normal, norma, out=np.zeros_like(normal), where=norma > 0)
+        colunas.append(np.abs(np.einsum('...i,...i', pb - pa, normal)))
+
+    centroide = posicoes.mean(axis=1)
+    colunas.append(centroide)
+    colunas.append(np.linalg.norm(centroide, axis=-1, keepdims=True))
+    return np.concatenate(colunas, axis=1)
+
+def metricas_resumo(metricas, topo):
+    """
+    Resumo por frame usado nas correlações com Caos/VR/Flux:
+    [aresta_media, aresta_dispersao, forma, centroide_r]
+    """
+    n_arestas = len(topo['arestas'])
+    arestas = metricas[:, :n_arestas]
+    n_forma = len(topo['tetraedros']) + len(topo['faces'])
+    forma = (metricas[:, n_arestas:n_arestas + n_forma].mean(axis=1) if n_forma
+             else np.zeros(len(metricas)))
+    return np.column_stack([arestas.mean(axis=1), arestas.std(axis=1), forma, metricas[:, -1]])
+
+NOMES_RESUMO = ['aresta_media', 'aresta_dispersao', 'forma', 'centroide_r']
+
+# ==================================================================================
+# MÓDULO II: ACUMULADORES MERGEÁVEIS (WELFORD / CHAN)
+# ==================================================================================
+
+class Momentos:
+    """
+    Média, variância, mínimo e máximo por coluna em memória O(k).
+    Blocos são combinados pela fórmula paralela de Chan, então dois
+    parciais de faixas disjuntas se juntam sem perder precisão.
+    """
+    def __init__(self, k):
+        self.n = 0
+        self.media = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.minimo = np.full(k, np.inf)
+        self.maximo = np.full(k, -np.inf)
+
+    def atualizar(self, x):
+        if len(x) == 0:
+            return self
+        bloco = Momentos(x.shape[1])
+        bloco.n = len(x)
+        bloco.media = x.mean(axis=0)
+        bloco.m2 = ((x - bloco.media) ** 2).sum(axis=0)
+        bloco.minimo = x.min(axis=0)
+        bloco.maximo = x.max(axis=0)
+        return self.merge(bloco)
+
+    def merge(self, outro):
+        if outro.n == 0:
+            return self
+        n = self.n + outro.n
+        delta = outro.media - self.media
+        self.media = self.media + delta * (outro.n / n)
+        self.m2 = self.m2 + outro.m2 + delta ** 2 * (self.n * outro.n / n)
+        self.minimo = np.minimum(self.minimo, outro.minimo)
+        self.maximo = np.maximum(self.maximo, outro.maximo)
+        self.n = n
+        return self
+
+    @property
+    def desvio(self):
+        return np.sqrt(self.m2 / self.n) if self.n else np.full_like(self.m2, np.nan)
+
+class Comomentos:
+    """
+    Matriz de covariância mergeável (correlações de Pearson em passagem única).
+    """
+    def __init__(self, k):
+        self.n = 0
+        self.media = np.zeros(k)
+        self.c = np.zeros((k, k))
+
+    def atualizar(self, x):
+        if len(x) == 0:
+            return self
+        bloco = Comomentos(x.shape[1])
+        bloco.n = len(x)
+        bloco.media = x.mean(axis=0)
+        centrado = x - bloco.media
+        bloco.c = centrado.T @ centrado
+        return self.merge(bloco)
+
+    def merge(self, outro):
+        if outro.n == 0:
+            return self
+        n = self.n + outro.n
+        delta = outro.media - self.media
+        self.c = self.c + outro.c + np.outer(delta, delta) * (self.n * outro.n / n)
+        self.media = self.media + delta * (outro.n / n)
+        self.n = n
+        return self
+
+    def correlacao(self):
+        d = np.sqrt(np.diag(self.c))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.c / np.outer(d, d)
+
+class _FaseJanelas:
+    """
+    Janelas de `tamanho` frames alinhadas a (frame + `deslocamento`). Só as
+    janelas ainda incompletas ficam em memória (no máximo as duas das bordas
+    de cada parcial); as fechadas viram o desvio máximo local e a faixa das
+    médias de janela (deriva lenta).
+    """
+    def __init__(self, k, tamanho, deslocamento=0, so_completas=False):
+        self.k = k
+        self.tamanho = tamanho
+        self.deslocamento = deslocamento
+        self.so_completas = so_completas
+        self.abertas = {}
+        self.n_fechadas = 0
+        self.desvio_max = np.zeros(k)
+        self.media_min = np.full(k, np.inf)
+        self.media_max = np.full(k, -np.inf)
+
+    def _fechar(self, janela):
+        acc = self.abertas.pop(janela)
+        self.n_fechadas += 1
+        self.desvio_max = np.maximum(self.desvio_max, acc.desvio)
+        self.media_min = np.minimum(self.media_min, acc.media)
+        self.media_max = np.maximum(self.media_max, acc.media)
+
+    def atualizar(self, frames, x):
+        ids = (frames + self.deslocamento) // self.tamanho
+        quebras = np.flatnonzero(np.diff(ids)) + 1
+        for ini, fim in zip(np.r_[0, quebras], np.r_[quebras, len(ids)]):
+            janela = int(ids[ini])
+            self.abertas.setdefault(janela, Momentos(self.k)).atualizar(x[ini:fim])
+            if self.abertas[janela].n >= self.tamanho:
+                self._fechar(janela)
+        return self
+
+    def merge(self, outro):
+        self.n_fechadas += outro.n_fechadas
+        self.desvio_max = np.maximum(self.desvio_max, outro.desvio_max)
+        self.media_min = np.minimum(self.media_min, outro.media_min)
+        self.media_max = np.maximum(self.media_max, outro.media_max)
+        for janela, acc in outro.abertas.items():
+            self.abertas.setdefault(janela, Momentos(self.k)).merge(acc)
+            if self.abertas[janela].n >= self.tamanho:
+                self._fechar(janela)
+        return self
+
+    def finalizar(self):
+        # Fim do dataset: janelas parciais das bordas contam (ou são descartadas)
+        for janela in list(self.abertas):
+            if self.so_completas:
+                del self.abertas[janela]
+            else:
+                self._fechar(janela)
+        return self
+
+class Janelas:
+    """
+    Estatísticas rolantes com janelas de `tamanho` frames e passo de meia
+    janela: duas fases de janelas fixas (alinhada e deslocada de tamanho/2),
+    ambas mergeáveis. A fase deslocada ignora as meias janelas das bordas.
+    """
+    def __init__(self, k, tamanho):
+        self.k = k
+        self.tamanho = tamanho
+        self.fases = [_FaseJanelas(k, tamanho)]
+        if tamanho >= 2:
+            self.fases.append(_FaseJanelas(k, tamanho, tamanho // 2, so_completas=True))
+
+    @property
+    def passo(self):
+        return self.tamanho // len(self.fases)
+
+    @property
+    def n_fechadas(self):
+        return sum(f.n_fechadas for f in self.fases)
+
+    @property
+    def desvio_max(self):
+        return np.max([f.desvio_max for f in self.fases], axis=0)
+
+    @property
+    def media_min(self):
+        return np.min([f.media_min for f in self.fases], axis=0)
+
+    @property
+    def media_max(self):
+        return np.max([f.media_max for f in self.fases], axis=0)
+
+    def atualizar(self, frames, x):
+        for fase in self.fases:
+            fase.atualizar(frames, x)
+        return self
+
+    def merge(self, outro):
+        for fase, fase_outro in zip(self.fases, outro.fases):
+            fase.merge(fase_outro)
+        return self
+
+    def finalizar(self):
+        for fase in self.fases:
+            fase.finalizar()
+        return self
+
+# ==================================================================================
+# MÓDULO III: RESULTADO PARCIAL
+# ==================================================================================
+
+class ResultadoIntegridade:
+    """
+    Resultado parcial de uma faixa de frames. `merge` é associativo, então
+    faixas processadas em paralelo podem ser reduzidas em qualquer ordem.
+    """
+    def __init__(self, n_qubits, janela=500):
+        self.n_qubits = n_qubits
+        self.topo = topologia(n_qubits)
+        self.nomes = nomes_metricas(self.topo)
+        k = len(self.nomes)
+        self.global_ = Momentos(k)
+        self.janelas = Janelas(k, janela)
+        self.correlacoes = Comomentos(len(NOMES_RESUMO) + len(ESCALARES_CORRELACAO))
+        # Primeiro frame da faixa (referência de deriva após o merge)
+        self.frame_ref = None
+        self.metricas_ref = None
+
+    def atualizar(self, frames, posicoes, escalares):
+        frames = np.asarray(frames, dtype=np.int64)
+        metricas = metricas_geometricas(posicoes, self.topo)
+        self.global_.atualizar(metricas)
+        self.janelas.atualizar(frames, metricas)
+
+        resumo = metricas_resumo(metricas, self.topo)
+        colunas = [np.asarray(escalares[k], dtype=np.float64) if k in escalares
+                   else np.full(len(frames), np.nan) for k in ESCALARES_CORRELACAO]
+        self.correlacoes.atualizar(np.column_stack([resumo] + colunas))
+
+        i = int(np.argmin(frames))
+        if self.frame_ref is None or frames[i] < self.frame_ref:
+            self.frame_ref, self.metricas_ref = int(frames[i]), metricas[i].copy()
+        return self
+
+    def merge(self, outro):
+        self.global_.merge(outro.global_)
+        self.janelas.merge(outro.janelas)
+        self.correlacoes.merge(outro.correlacoes)
+        if outro.frame_ref is not None and (self.frame_ref is None
+                                            or outro.frame_ref < self.frame_ref):
+            self.frame_ref, self.metricas_ref = outro.frame_ref, outro.metricas_ref
+        return self
+
+    def relatorio(self):
+        """
+        Consolida o resultado final (após todos os merges).
+        """
+        self.janelas.finalizar()
+        g = self.global_
+        ref = self.metricas_ref
+        deriva = np.maximum(np.abs(g.maximo - ref), np.abs(g.minimo - ref))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            deriva_rel = np.where(np.abs(ref) > 1e-12, deriva / np.abs(ref), np.nan)
+
+        metricas = {}
+        for i, nome in enumerate(self.nomes):
+            metricas[nome] = {
+                'referencia': ref[i], 'media': g.media[i], 'desvio': g.desvio[i],
+                'minimo': g.minimo[i], 'maximo': g.maximo[i],
+                'deriva_max': deriva[i], 'deriva_rel': deriva_rel[i],
+                'janela_desvio_max': self.janelas.desvio_max[i],
+                'janela_deriva_media': self.janelas.media_max[i] - self.janelas.media_min[i],
+            }
+
+        corr = self.correlacoes.correlacao()
+        n_resumo = len(NOMES_RESUMO)
+        correlacoes = {
+            nome: {esc: corr[i, n_resumo + j] for j, esc in enumerate(ESCALARES_CORRELACAO)}
+            for i, nome in enumerate(NOMES_RESUMO)
+        }
+        return {'frames': g.n, 'frame_referencia': self.frame_ref,
+                'janela': self.janelas.tamanho, 'passo': self.janelas.passo,
+                'metricas': metricas,
+                'correlacoes': correlacoes}
+
+# ==================================================================================
+# MÓDULO IV: LEITURA EM STREAMING (SEM PANDAS)
+# ==================================================================================
+
+def _ler_cabecalho(caminho):
+    with open(caminho, 'rb') as f:
+        colunas = f.readline().decode('utf-8').strip().split(',')
+        return colunas, f.tell()
+
+def ler_blocos_csv(caminho, inicio_byte=0, fim_byte=None, tamanho_bloco=8192):
+    """
+    Gera (frames, escalares, posicoes) em blocos de linhas do CSV do gerador.
+    Processa as linhas que COMEÇAM em [inicio_byte, fim_byte), então faixas
+    contíguas de bytes particionam o arquivo sem duplicar nem perder linhas.
+    """
+    colunas, fim_cabecalho = _ler_cabecalho(caminho)
+    indice = {c: i for i, c in enumerate(colunas)}
+    n_qubits = sum(1 for c in colunas if c.startswith('q') and c.endswith('_x'))
+    idx_pos = np.array([[indice[f'q{q}_{e}'] for e in 'xyz'] for q in range(n_qubits)])
+    idx_esc = {k: indice[k] for k in ESCALARES_CORRELACAO if k in indice}
+    fim_byte = os.path.getsize(caminho) if fim_byte is None else fim_byte
+
+    with open(caminho, 'rb') as f:
+        if inicio_byte <= fim_cabecalho:
+            f.seek(fim_cabecalho)
+        else:
+            # Descarta a linha parcial: ela pertence à faixa anterior
+            f.seek(inicio_byte - 1)
+            f.readline()
+        while f.tell() < fim_byte:
+            linhas = []
+            while len(linhas) < tamanho_bloco and f.tell() < fim_byte:
+                linha = f.readline()
+                if not linha:
+                    break
+                if linha.strip():
+                    linhas.append(linha)
+            if not linhas:
+                break
+            tabela = np.loadtxt(linhas, delimiter=',', ndmin=2)
+            yield (tabela[:, indice['Frame']].astype(np.int64),
+                   {k: tabela[:, i] for k, i in idx_esc.items()},
+                   tabela[:, idx_pos])
+
+def analisar_csv(caminho, inicio_byte=0, fim_byte=None, janela=500, tamanho_bloco=8192):
+    """
+    Resultado parcial de uma faixa de bytes do CSV (unidade de trabalho paralela).
+    """
+    resultado = None
+    for frames, escalares, posicoes in ler_blocos_csv(caminho, inicio_byte, fim_byte,
+                                                      tamanho_bloco):
+        if resultado is None:
+            resultado = ResultadoIntegridade(posicoes.shape[1], janela)
+        resultado.atualizar(frames, posicoes, escalares)
+    return resultado
+
+def analisar_matriz(posicoes, escalares, frame_ini=0, frame_fim=None, janela=500,
+                    tamanho_bloco=None):
+    """
+    Mesma análise sobre arrays [frames, qubits, 3] já disponíveis (ou memmap),
+    restrita à faixa de frames [frame_ini, frame_fim).
+    """
+    frame_fim = len(posicoes) if frame_fim is None else frame_fim
+    # ~1M posições por bloco: memória constante também em enxames grandes
+    tamanho_bloco = tamanho_bloco or max((1 << 20) // posicoes.shape[1], 1)
+    resultado = ResultadoIntegridade(posicoes.shape[1], janela)
+    for ini in range(frame_ini, frame_fim, tamanho_bloco):
+        fim = min(ini + tamanho_bloco, frame_fim)
+        resultado.atualizar(np.arange(ini, fim), np.asarray(posicoes[ini:fim], dtype=np.float64),
+                            {k: np.asarray(v[ini:fim]) for k, v in escalares.items()})
+    return resultado
+
+def analisar_faixa_bloco(caminho, frame_ini, frame_fim, janela=500):
+    """
+    Resultado parcial de uma faixa de frames de um dataset em bloco (.harpia).
+    """
+    bloco = carregar_bloco(caminho)
+    return analisar_matriz(bloco.posicoes, bloco.escalares, frame_ini, frame_fim, janela)
+
+def _faixas_bloco(caminho, n_processos, janela):
+    # Cortes alinhados à janela: as janelas alinhadas ficam inteiras num parcial
+    # (as deslocadas de meia janela cruzam o corte e são juntadas no merge)
+    total = carregar_bloco(caminho).total_frames
+    n_janelas = -(-total // janela)
+    cortes = np.minimum(np.linspace(0, n_janelas, n_processos + 1).astype(np.int64) * janela, total)
+    return [(int(a), int(b)) for a, b in zip(cortes[:-1], cortes[1:]) if b > a]
+
+def analisar_paralelo(caminho, n_processos=None, janela=500):
+    """
+    Divide o dataset em faixas (de bytes no CSV, de frames no bloco .harpia),
+    analisa cada uma num processo e reduz os parciais com `merge`.
+    """
+    n_processos = n_processos or os.cpu_count() or 1
+    if e_bloco(caminho):
+        faixas = _faixas_bloco(caminho, n_processos, janela)
+        with ProcessPoolExecutor(n_processos) as pool:
+            parciais = list(pool.map(analisar_faixa_bloco, [caminho] * len(faixas),
+                                     [a for a, _ in faixas], [b for _, b in faixas],
+                                     [janela] * len(faixas)))
+        return _reduzir(parciais, caminho)
+
+    _, fim_cabecalho = _ler_cabecalho(caminho)
+    tamanho = os.path.getsize(caminho)
+    cortes = np.linspace(fim_cabecalho, tamanho, n_processos + 1).astype(np.int64)
+    faixas = list(zip(cortes[:-1], cortes[1:]))
+    if n_processos == 1:
+        parciais = [analisar_csv(caminho, int(a), int(b), janela) for a, b in faixas]
+    else:
+        with ProcessPoolExecutor(n_processos) as pool:
+            parciais = list(pool.map(analisar_csv, [caminho] * len(faixas),
+                                     [int(a) for a, _ in faixas], [int(b) for _, b in faixas],
+                                     [janela] * len(faixas)))
+    return _reduzir([p for p in parciais if p is not None], caminho)
+
+def _reduzir(parciais, caminho):
+    if not parciais:
+        raise ValueError(f"Dataset sem frames: {caminho}")
+    resultado = parciais[0]
+    for parcial in parciais[1:]:
+        resultado.merge(parcial)
+    return resultado
+
+# ==================================================================================
+# MÓDULO V: RELATÓRIO
+# ==================================================================================
+
+def imprimir_relatorio(rel):
+    metricas = rel['metricas']
+    arestas = {k: v for k, v in metricas.items() if k.startswith('aresta_')}
+    pior = max(arestas, key=lambda k: arestas[k]['deriva_rel'])
+
+    print("\n" + "📐" * 35)
+    print(f"✅ INTEGRITY ANALYSIS COMPLETE.")
+    print(f"📦 Frames: {rel['frames']} (janela rolante: {rel['janela']} frames, passo {rel['passo']})")
+    print(f"📏 Pior aresta: {pior} | deriva {arestas[pior]['deriva_rel'] * 100:.4f}% "
+          f"| jitter local máx {arestas[pior]['janela_desvio_max']:.6f}")
+    for nome, m in metricas.items():
+        if nome.startswith(('volume_', 'planaridade_')):
+            print(f"🔺 {nome}: média {m['media']:.6f} | desvio {m['desvio']:.6f} "
+                  f"| deriva máx {m['deriva_max']:.6f}")
+    c = metricas['centroide_r']
+    print(f"🎯 Centroide: |c| médio {c['media']:.6f} | deriva máx {c['deriva_max']:.6f}")
+    for nome, corr in rel['correlacoes'].items():
+        texto = ' | '.join(f"{esc}: {r:+.3f}" for esc, r in corr.items())
+        print(f"🔗 {nome}: {texto}")
+    print("📐" * 35)
+
+if __name__ == "__main__":
+    # Uso: python sphy_harpia_integrity.py dataset.csv|dataset.harpia [processos] [janela]
+    if len(sys.argv) < 2:
+        print("Uso: python sphy_harpia_integrity.py <dataset.csv|dataset.harpia> [processos] [janela]")
+        sys.exit()
+    n_processos = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    janela = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    inicio = time.perf_counter()
+    resultado = analisar_paralelo(sys.argv[1], n_processos, janela)
+    dt = time.perf_counter() - inicio
+    rel = resultado.relatorio()
+    imprimir_relatorio(rel)
+    print(f"⚡ {rel['frames'] / dt:.0f} frames/s ({dt:.2f} s)")
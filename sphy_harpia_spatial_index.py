@@ -0,0 +1,422 @@
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 🌌 PROJECT: HARPIA GEOMETRY ENGINE [SPATIAL INDEX]
+# 🧭 OBJECT: Índice espaço-temporal das trajetórias [frames, qubits, 3]
+# 🎯 CONSULTAS: Raio (range), Vizinho mais próximo, Raio de picking (cursor)
+# ⚡ ENGINE: AABB por bloco de frames + Grade uniforme por frame (NumPy)
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 👤 AUTHOR: Deywe Okabe & Gemini
+# 🛠️ VERSION: 1.0.0 "Akashic Compass"
+# ─────────────────────────────────────────────────────────────────────────────────────────
+import collections
+import functools
+import os
+import sys
+import time
+
+import numpy as np
+
+# Abaixo disso a busca exaustiva vetorizada é mais rápida que montar a grade
+LIMIAR_GRADE = 256
+QUBITS_POR_CELULA = 4
+# Bits por eixo na chave de Morton (3 x 21 = 63 bits)
+BITS_EIXO = 21
+# Índices salvos com outra versão são reconstruídos (v2: caixas arredondadas para fora)
+VERSAO_INDICE = 2
+
+# ==================================================================================
+# MÓDULO I: GRADE UNIFORME (UM FRAME)
+# ==================================================================================
+
+def _expandir_faixas(ini, fim):
+    """
+    Concatena os intervalos [ini[i], fim[i]) sem loop Python.
+    """
+    tamanhos = fim - ini
+    total = int(tamanhos.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.intp)
+    deslocamento = np.repeat(ini - np.cumsum(np.r_[0, tamanhos[:-1]]), tamanhos)
+    return deslocamento + np.arange(total)
+
+# Byte -> bits nas posições múltiplas de 3 (intercalação de Morton por tabela)
+_ESPALHAR_BYTE = np.array([sum(((b >> i) & 1) << (3 * i) for i in range(8)) for b in range(256)],
+                          dtype=np.uint64)
+
+def _morton(cel):
+    # 21 bits por eixo em três fatias (8 + 8 + 5), os três eixos de uma vez
+    cel = np.asarray(cel, dtype=np.int64)
+    e = (_ESPALHAR_BYTE[cel & 0xFF] | (_ESPALHAR_BYTE[(cel >> 8) & 0xFF] << np.uint64(24))
+         | (_ESPALHAR_BYTE[(cel >> 16) & 0x1F] << np.uint64(48)))
+    return (e[..., 0] << np.uint64(2)) | (e[..., 1] << np.uint64(1)) | e[..., 2]
+
+@functools.lru_cache(maxsize=None)
+def _vizinhanca(m):
+    return np.stack(np.meshgrid(*[np.arange(-m, m + 1)] * 3, indexing='ij'),
+                    axis=-1).reshape(-1, 3)
+
+class _GradeFrame:
+    """
+    Grade hierárquica: os qubits ficam ordenados pela chave de Morton da célula
+    fina (2^20 células na maior extensão), então toda célula de qualquer nível
+    k (lado fina * 2^k) é um intervalo contíguo via searchsorted.
+
+    O nível base é o menor com ~QUBITS_POR_CELULA qubits por célula OCUPADA
+    (medido, não estimado pelo volume): um anel plano de 100k qubits fica com
+    células pequenas ao longo da curva em vez de poucas células cheias.
+    Cada consulta usa o nível base ou um mais grosso, conforme o seu raio,
+    para visitar poucas células.
+    """
+    def __init__(self, pos):
+        self.pos = pos
+        n = len(pos)
+        self.lo = pos.min(axis=0)
+        self.hi = pos.max(axis=0)
+        self.fina = max(float((self.hi - self.lo).max()), 1e-9) / (1 << (BITS_EIXO - 1))
+        cel = np.floor((pos - self.lo) / self.fina).astype(np.int64)
+        self.dims_fina = np.minimum(cel.max(axis=0) + 1, 1 << BITS_EIXO)
+        chaves = _morton(np.minimum(cel, (1 << BITS_EIXO) - 1))
+        self.ordem = np.argsort(chaves)
+        self.chaves = chaves[self.ordem]
+        # Posições na ordem de Morton: candidatos de uma célula são contíguos
+        self.pos_ord = pos[self.ordem]
+        self.nivel = self._nivel_ocupacao(n)
+        self.celula = self.fina * 2.0 ** self.nivel
+
+    def _ocupadas(self, k):
+        grossas = self.chaves >> np.uint64(3 * k)
+        return 1 + int(np.count_nonzero(grossas[1:] != grossas[:-1]))
+
+    def _nivel_ocupacao(self, n):
+        # Ocupação média cresce com o nível: busca binária pelo menor nível com >= Q
+        a, b = 0, BITS_EIXO - 1
+        while a < b:
+            k = (a + b) // 2
+            if n / self._ocupadas(k) >= QUBITS_POR_CELULA:
+                b = k
+            else:
+                a = k + 1
+        return a
+
+    def nivel_para(self, raio):
+        """
+        Nível com célula >= raio (nunca abaixo do nível base).
+        """
+        k = int(np.ceil(np.log2(max(raio, self.fina) / self.fina)))
+        return min(max(k, self.nivel), BITS_EIXO - 1)
+
+    def _candidatos(self, cel, k):
+        """
+        Posições (na ordem de Morton) dos qubits das células [K, 3] do nível k;
+        os ids dos qubits são `ordem[...]`. Células fora da grade são ignoradas.
+        """
+        dims = ((self.dims_fina - 1) >> k) + 1
+        dentro = np.all((cel >= 0) & (cel < dims), axis=1)
+        base = np.unique(_morton(cel[dentro])) << np.uint64(3 * k)
+        ini = np.searchsorted(self.chaves, base, 'left')
+        fim = np.searchsorted(self.chaves, base + np.uint64(1 << (3 * k)), 'left')
+        return _expandir_faixas(ini, fim)
+
+    def caixa(self, p_min, p_max):
+        # Nível em que a caixa cobre no máximo ~4 células por eixo
+        k = self.nivel_para(float(np.max(p_max - p_min)) / 4)
+        celula = self.fina * 2.0 ** k
+        c_min = np.maximum(np.floor((p_min - self.lo) / celula).astype(np.int64), 0)
+        c_max = np.floor((p_max - self.lo) / celula).astype(np.int64)
+        if np.any(c_max < c_min):
+            return np.zeros(0, dtype=np.intp)
+        eixos = [np.arange(a, b + 1) for a, b in zip(c_min, c_max)]
+        cel = np.stack(np.meshgrid(*eixos, indexing='ij'), axis=-1).reshape(-1, 3)
+        return self._candidatos(cel, k)
+
+    def ao_longo(self, origem, direcao, raio):
+        """
+        Candidatos a até `raio` do raio: amostra o segmento dentro da grade a
+        cada meia célula (nível com célula >= raio) e dilata as células
+        visitadas pela margem do raio.
+        """
+        # Célula >= 4/3 do raio: a dilatação fica em 1 célula (27 vizinhas)
+        k = self.nivel_para(raio * 4 / 3)
+        celula = self.fina * 2.0 ** k
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t1 = (self.lo - raio - origem) / direcao
+            t2 = (self.hi + raio - origem) / direcao
+        t1 = np.where(direcao == 0, -np.inf, t1)
+        t2 = np.where(direcao == 0, np.inf, t2)
+        fora = (direcao == 0) & ((origem < self.lo - raio) | (origem > self.hi + raio))
+        t_ini = max(float(np.minimum(t1, t2).max()), 0.0)
+        t_fim = float(np.maximum(t1, t2).min())
+        if np.any(fora) or t_fim < t_ini:
+            return np.zeros(0, dtype=np.intp)
+
+        passo = celula * 0.5
+        t = np.arange(t_ini, t_fim + passo, passo)
+        cel = np.floor((origem + t[:, None] * direcao - self.lo) / celula).astype(np.int64)
+        # Meia célula de passo: o ponto amostrado fica a <= 1/4 de célula do raio real
+        m = int(np.ceil(raio / celula + 0.25))
+        # Amostras consecutivas caem na mesma célula: basta comparar com a anterior
+        cel = cel[np.r_[True, np.any(cel[1:] != cel[:-1], axis=1)]]
+        return self._candidatos((cel[:, None, :] + _vizinhanca(m)).reshape(-1, 3), k)
+
+# ==================================================================================
+# MÓDULO II: ÍNDICE ESPAÇO-TEMPORAL
+# ==================================================================================
+
+def _para_baixo(valores):
+    # float64 -> float32 arredondando para -inf: a caixa nunca encolhe
+    v32 = valores.astype(np.float32)
+    return np.where(v32 > valores, np.nextafter(v32, np.float32(-np.inf)), v32)
+
+def _para_cima(valores):
+    v32 = valores.astype(np.float32)
+    return np.where(v32 < valores, np.nextafter(v32, np.float32(np.inf)), v32)
+
+def _distancia2_caixa(p, c_min, c_max):
+    gap = np.maximum(np.maximum(c_min - p, p - c_max), 0.0)
+    return (gap * gap).sum(axis=-1)
+
+class Harpia_Spatial_Index:
+    """
+    Nível temporal: AABB por (bloco de `bloco` frames, qubit) e do bloco todo,
+    para podar consultas ao longo de toda a execução.
+    Nível espacial: grade uniforme do frame consultado (cache LRU), para
+    picking e vizinhos em enxames grandes.
+    """
+    def __init__(self, posicoes, bloco=64, caixas_min=None, caixas_max=None):
+        self.posicoes = posicoes
+        self.total_frames, self.n_qubits, _ = posicoes.shape
+        self.bloco = bloco
+        if caixas_min is None:
+            caixas_min, caixas_max = self._construir_caixas()
+        self.caixas_min = caixas_min
+        self.caixas_max = caixas_max
+        self.bloco_min = caixas_min.min(axis=1)
+        self.bloco_max = caixas_max.max(axis=1)
+        self._grade = functools.lru_cache(maxsize=8)(self._montar_grade)
+        self._consultados = collections.OrderedDict()
+
+    def _construir_caixas(self, frames_por_passo=1 << 16):
+        n_blocos = -(-self.total_frames // self.bloco)
+        caixas_min = np.empty((n_blocos, self.n_qubits, 3), dtype=np.float32)
+        caixas_max = np.empty((n_blocos, self.n_qubits, 3), dtype=np.float32)
+        passo = max(frames_por_passo // self.bloco, 1) * self.bloco
+        # Em passos para funcionar sobre memmap sem carregar o dataset inteiro
+        for ini in range(0, self.total_frames, passo):
+            trecho = np.asarray(self.posicoes[ini:ini + passo])
+            b0 = ini // self.bloco
+            for j, b in enumerate(range(0, len(trecho), self.bloco)):
+                caixas_min[b0 + j] = _para_baixo(trecho[b:b + self.bloco].min(axis=0))
+                caixas_max[b0 + j] = _para_cima(trecho[b:b + self.bloco].max(axis=0))
+        return caixas_min, caixas_max
+
+    def _montar_grade(self, frame):
+        return _GradeFrame(np.asarray(self.posicoes[frame], dtype=np.float64))
+
+    def _grade_frame(self, frame):
+        """
+        Grade do frame, ou None para a busca exaustiva. A grade só é montada a
+        partir da 2ª consulta ao mesmo frame: no playback cada frame é
+        consultado uma vez e o O(n) vetorizado custa menos que ordenar.
+        """
+        if self.n_qubits <= LIMIAR_GRADE:
+            return None
+        if frame in self._consultados:
+            return self._grade(frame)
+        self._consultados[frame] = True
+        if len(self._consultados) > 64:
+            self._consultados.popitem(last=False)
+        return None
+
+    # --- Consultas ao longo do tempo ---
+
+    def frames_proximos(self, ponto, distancia, qubits=None):
+        """
+        Frames em que algum vértice (ou algum de `qubits`) passa a até
+        `distancia` de `ponto`.
+        """
+        p = np.asarray(ponto, dtype=np.float64)
+        d2 = distancia * distancia
+        qubits = np.arange(self.n_qubits) if qubits is None else np.asarray(qubits)
+        if len(qubits) == self.n_qubits:
+            candidatos = _distancia2_caixa(p, self.bloco_min, self.bloco_max) <= d2
+        else:
+            candidatos = np.ones(len(self.caixas_min), dtype=bool)
+
+        # Segunda poda (por qubit) vetorizada sobre todos os blocos candidatos
+        blocos = np.flatnonzero(candidatos)
+        perto_bloco = _distancia2_caixa(p, self.caixas_min[blocos][:, qubits],
+                                        self.caixas_max[blocos][:, qubits]) <= d2
+        encontrados = []
+        for b, mascara in zip(blocos, perto_bloco):
+            perto = qubits[mascara]
+            if len(perto) == 0:
+                continue
+            ini = b * self.bloco
+            trecho = np.asarray(self.posicoes[ini:ini + self.bloco, perto], dtype=np.float64)
+            dentro = (((trecho - p) ** 2).sum(axis=-1) <= d2).any(axis=1)
+            encontrados.append(ini + np.flatnonzero(dentro))
+        return np.concatenate(encontrados) if encontrados else np.zeros(0, dtype=np.int64)
+
+    # --- Consultas num frame ---
+
+    def qubits_no_raio(self, frame, ponto, distancia):
+        p = np.asarray(ponto, dtype=np.float64)
+        grade = self._grade_frame(frame)
+        if grade is None:
+            pos = np.asarray(self.posicoes[frame], dtype=np.float64)
+            cand = np.arange(self.n_qubits)
+        else:
+            idx = grade.caixa(p - distancia, p + distancia)
+            pos, cand = grade.pos_ord[idx], grade.ordem[idx]
+        d2 = ((pos - p) ** 2).sum(axis=1)
+        dentro = d2 <= distancia * distancia
+        ordem = np.argsort(d2[dentro])
+        return cand[dentro][ordem], np.sqrt(d2[dentro][ordem])
+
+    def vizinho_mais_proximo(self, frame, ponto, k=1):
+        """
+        Os `k` qubits mais próximos de `ponto` no frame: (qubits, distancias).
+        """
+        k = min(k, self.n_qubits)
+        p = np.asarray(ponto, dtype=np.float64)
+        grade = self._grade_frame(frame)
+        if grade is None:
+            d2 = ((np.asarray(self.posicoes[frame], dtype=np.float64) - p) ** 2).sum(axis=1)
+            cand = np.argpartition(d2, k - 1)[:k] if k < self.n_qubits else np.arange(k)
+            cand = cand[np.argsort(d2[cand])]
+            return cand, np.sqrt(d2[cand])
+        # Busca em raio crescente: tudo dentro do raio foi examinado, então os
+        # k achados são exatos assim que existirem
+        raio = grade.celula + np.sqrt(_distancia2_caixa(p, grade.lo, grade.hi))
+        while True:
+            qubits, dist = self.qubits_no_raio(frame, p, raio)
+            if len(qubits) >= k:
+                return qubits[:k], dist[:k]
+            raio *= 2.0
+
+    def raio(self, frame, origem, direcao, raio_pick=0.5):
+        """
+        Picking: primeiro qubit (menor t ao longo do raio) cuja esfera de raio
+        `raio_pick` (escalar ou um por qubit) é atingida. Retorna (qubit, t) ou
+        (None, inf).
+        """
+        o = np.asarray(origem, dtype=np.float64)
+        d = np.asarray(direcao, dtype=np.float64)
+        d = d / np.linalg.norm(d)
+        raios = np.broadcast_to(np.asarray(raio_pick, dtype=np.float64), (self.n_qubits,))
+        grade = self._grade_frame(frame)
+        if grade is None:
+            pos = np.asarray(self.posicoes[frame], dtype=np.float64)
+            cand = np.arange(self.n_qubits)
+        else:
+            idx = grade.ao_longo(o, d, float(np.max(raio_pick)))
+            pos, cand = grade.pos_ord[idx], grade.ordem[idx]
+        r2 = raios[cand] ** 2
+        rel = pos - o
+        t = rel @ d
+        d2 = (rel * rel).sum(axis=1) - t * t
+        # Ponto de entrada na esfera; atrás da origem não conta
+        t_hit = t - np.sqrt(np.maximum(r2 - d2, 0.0))
+        valido = (d2 <= r2) & (t >= 0)
+        if not np.any(valido):
+            return None, np.inf
+        i = np.argmin(np.where(valido, t_hit, np.inf))
+        return int(cand[i]), float(t_hit[i])
+
+    pick = raio
+
+    # --- Persistência ---
+
+    def salvar(self, caminho, impressao=None):
+        np.savez(caminho, versao=VERSAO_INDICE, bloco=self.bloco, caixas_min=self.caixas_min,
+                 caixas_max=self.caixas_max, forma=np.array(self.posicoes.shape),
+                 impressao=np.array(impressao or ''))
+
+    @classmethod
+    def carregar(cls, caminho, posicoes, impressao=None):
+        """
+        Carrega o índice salvo; devolve None se ele não corresponde mais ao dataset.
+        """
+        with np.load(caminho) as dados:
+            if 'versao' not in dados or int(dados['versao']) != VERSAO_INDICE:
+                return None
+            if tuple(dados['forma']) != tuple(posicoes.shape):
+                return None
+            if impressao is not None and str(dados['impressao']) != impressao:
+                return None
+            return cls(posicoes, int(dados['bloco']), dados['caixas_min'], dados['caixas_max'])
+
+def caminho_indice(dataset):
+    return os.path.splitext(dataset)[0] + '.idx.npz'
+
+def _impressao(dataset):
+    if os.path.isdir(dataset):
+        # Dataset em bloco (.harpia): o conteúdo está em posicoes.npy
+        dataset = os.path.join(dataset, 'posicoes.npy')
+    info = os.stat(dataset)
+    return f'{info.st_size}:{info.st_mtime_ns}'
+
+def indice_para_dataset(dataset, posicoes, bloco=64):
+    """
+    Usa o índice salvo ao lado do dataset ou constrói e salva um novo.
+    Fontes que não são arquivo (ex.: tcp://) recebem um índice só em memória.
+    """
+    if not os.path.exists(dataset):
+        return Harpia_Spatial_Index(posicoes, bloco)
+    destino = caminho_indice(dataset)
+    impressao = _impressao(dataset)
+    if os.path.isfile(destino):
+        indice = Harpia_Spatial_Index.carregar(destino, posicoes, impressao)
+        if indice is not None:
+            return indice
+    indice = Harpia_Spatial_Index(posicoes, bloco)
+    indice.salvar(destino, impressao)
+    return indice
+
+def _trajetorias_benchmark(total_frames, n_qubits, layout):
+    t = np.arange(total_frames)[:, None] * 0.01
+    if layout == 'anel':
+        # Como o enxame (Horn Torus): todos os qubits no mesmo z, espaçados no anel
+        fase = np.arange(n_qubits)[None, :] * (2 * np.pi / n_qubits) + t
+        z = np.full_like(fase, 1.67)
+        return np.stack([20 * np.cos(fase), 20 * np.sin(fase), z], axis=-1).astype(np.float32)
+    angulos = np.random.uniform(0, 2 * np.pi, size=(1, n_qubits, 2))
+    fase = angulos + t[..., None]
+    return np.stack([20 * np.cos(fase[..., 0]), 20 * np.sin(fase[..., 0]),
+                     10 * np.sin(fase[..., 1])], axis=-1).astype(np.float32)
+
+if __name__ == "__main__":
+    # Benchmark: python sphy_harpia_spatial_index.py [frames] [qubits] [cilindro|anel]
+    total_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    n_qubits = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    layout = sys.argv[3] if len(sys.argv) > 3 else 'cilindro'
+    posicoes = _trajetorias_benchmark(total_frames, n_qubits, layout)
+
+    inicio = time.perf_counter()
+    indice = Harpia_Spatial_Index(posicoes)
+    print(f"🧭 Índice ({layout}): {total_frames} frames x {n_qubits} qubits "
+          f"em {time.perf_counter() - inicio:.3f} s")
+
+    inicio = time.perf_counter()
+    frames = indice.frames_proximos((20.0, 0.0, 0.0), 0.5)
+    print(f"🎯 frames_proximos: {len(frames)} frames em {(time.perf_counter() - inicio) * 1e3:.2f} ms")
+
+    frame = total_frames // 2
+    alvo = posicoes[frame, 0].astype(np.float64)
+    origem = alvo + np.array([5.0, -5.0, 50.0])
+    direcao = alvo - origem
+    # 1ª consulta do frame: busca exaustiva (caso do playback)
+    inicio = time.perf_counter()
+    indice.pick(frame, origem, direcao, 0.3)
+    print(f"🖱️  pick (frame novo, exaustivo): {(time.perf_counter() - inicio) * 1e3:.2f} ms")
+    inicio = time.perf_counter()
+    indice.pick(frame, origem, direcao, 0.3)
+    print(f"🧱 pick + montagem da grade: {(time.perf_counter() - inicio) * 1e3:.2f} ms")
+    if indice.n_qubits > LIMIAR_GRADE:
+        grade = indice._grade(frame)
+        print(f"   célula base {grade.celula:.4g} | "
+              f"{indice.n_qubits / grade._ocupadas(grade.nivel):.1f} qubits por célula ocupada")
+    n = 1000
+    inicio = time.perf_counter()
+    for _ in range(n):
+        qubit, _ = indice.pick(frame, origem, direcao, 0.3)
+    print(f"🖱️  pick (grade em cache): qubit {qubit} em {(time.perf_counter() - inicio) / n * 1e6:.1f} µs")
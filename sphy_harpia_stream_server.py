@@ -0,0 +1,728 @@
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 🌌 PROJECT: HARPIA GEOMETRY ENGINE [STREAM SERVER]
+# 📡 OBJECT: Servidor asyncio de frames para múltiplos visualizadores remotos
+# 🔌 TRANSPORTE: TCP (binário) + WebSocket (opcional)
+# ⚡ ENGINE: Fan-out com backpressure e descarte de clientes lentos
+# ─────────────────────────────────────────────────────────────────────────────────────────
+# 👤 AUTHOR: Deywe Okabe & Gemini
+# 🛠️ VERSION: 1.0.0 "Akashic Broadcast"
+# ─────────────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import collections
+import functools
+import json
+import struct
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from sphy_harpia_bloco import carregar_bloco, e_bloco
+
+# 1. VERIFICAÇÃO DE DEPENDÊNCIAS
+# --- WEBSOCKETS (Opcional: dashboards web) ---
+try:
+    import websockets
+    import websockets.exceptions
+    WEBSOCKETS_AVAILABLE = True
+    _ERROS_CONEXAO = (ConnectionError, asyncio.IncompleteReadError,
+                      websockets.exceptions.ConnectionClosed)
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+    _ERROS_CONEXAO = (ConnectionError, asyncio.IncompleteReadError)
+
+# ==================================================================================
+# MÓDULO I: PROTOCOLO BINÁRIO
+# ==================================================================================
+# Cada mensagem TCP: [u32 tamanho][u8 tipo][payload]. No WebSocket o enquadramento
+# é do próprio protocolo, então a mensagem é apenas [u8 tipo][payload].
+#
+# Handshake: o servidor envia META e só começa a transmitir após o INICIO do cliente.
+#
+# Servidor -> Cliente
+#   MSG_META   : JSON utf-8 {n_qubits, total_frames, escalares}
+#   MSG_FRAME  : i64 frame | f64[n_escalares] | f32[n_qubits * 3]
+#   MSG_FIM    : vazio (fim do dataset; o cliente pode enviar SEEK para reiniciar)
+# Cliente -> Servidor
+#   MSG_INICIO : i64 frame inicial (-1 = padrão da fonte) | f64 fps
+#   MSG_SEEK   : i64 frame
+#   MSG_RATE   : f64 fps (0 = modo bulk sem perdas)
+
+MSG_META = 0x01
+MSG_FRAME = 0x02
+MSG_FIM = 0x03
+MSG_INICIO = 0x12
+MSG_SEEK = 0x10
+MSG_RATE = 0x11
+
+_CABECALHO = struct.Struct('<IB')
+_FRAME_IDX = struct.Struct('<q')
+_INICIO = struct.Struct('<qd')
+_SEEK = struct.Struct('<q')
+_RATE = struct.Struct('<d')
+# Maior payload de controle (INICIO = 16 bytes); acima disso a conexão é encerrada
+TAMANHO_MAX_CONTROLE = _INICIO.size
+
+class ErroProtocolo(Exception):
+    pass
+
+ESCALARES_PADRAO = ['T', 'Caos_Global', 'VR_Gain_Avg', 'Quantum_Flux']
+
+def empacotar_frame(idx, escalares, posicoes):
+    """
+    Serializa um frame (sem o cabeçalho de transporte).
+    """
+    return (bytes([MSG_FRAME]) + _FRAME_IDX.pack(int(idx))
+            + np.asarray(escalares, dtype='<f8').tobytes()
+            + np.asarray(posicoes, dtype='<f4').tobytes())
+
+def desempacotar_frame(payload, n_escalares, n_qubits):
+    idx, = _FRAME_IDX.unpack_from(payload, 0)
+    ini = _FRAME_IDX.size
+    escalares = np.frombuffer(payload, dtype='<f8', count=n_escalares, offset=ini)
+    ini += 8 * n_escalares
+    posicoes = np.frombuffer(payload, dtype='<f4', count=n_qubits * 3, offset=ini)
+    return idx, escalares, posicoes.reshape(n_qubits, 3)
+
+def _enquadrar(mensagem):
+    return _CABECALHO.pack(len(mensagem) - 1, mensagem[0]) + mensagem[1:]
+
+# ==================================================================================
+# MÓDULO II: FONTES DE FRAMES
+# ==================================================================================
+
+def colunas_para_arrays(df, n_qubits=None):
+    """
+    DataFrame no formato do CSV do gerador -> (frames, escalares, posicoes [frames, qubits, 3]).
+    """
+    if n_qubits is None:
+        n_qubits = sum(1 for c in df.columns if c.startswith('q') and c.endswith('_x'))
+    posicoes = np.zeros((len(df), n_qubits, 3), dtype=np.float32)
+    for q in range(n_qubits):
+        posicoes[:, q, 0] = df[f'q{q}_x'].values
+        posicoes[:, q, 1] = df[f'q{q}_y'].values
+        posicoes[:, q, 2] = df[f'q{q}_z'].values
+    frames = df['Frame'].values if 'Frame' in df.columns else np.arange(len(df))
+    escalares = {k: df[k].values for k in ESCALARES_PADRAO if k in df.columns}
+    return frames, escalares, posicoes
+
+class FonteDataset:
+    """
+    Dataset armazenado com acesso aleatório (seek livre para todos os clientes).
+    """
+    def __init__(self, posicoes, escalares, cache_frames=4096):
+        self.posicoes = np.asarray(posicoes, dtype=np.float32)
+        self.total_frames, self.n_qubits, _ = self.posicoes.shape
+        self.nomes_escalares = list(escalares)
+        self.escalares = np.column_stack(
+            [np.asarray(escalares[k], dtype=np.float64) for k in self.nomes_escalares]
+        ) if self.nomes_escalares else np.zeros((self.total_frames, 0))
+        # Cache compartilhado: clientes no mesmo frame reaproveitam os mesmos bytes
+        self.mensagem = functools.lru_cache(maxsize=cache_frames)(self._mensagem)
+
+    @classmethod
+    def from_dataframe(cls, df, n_qubits=None):
+        _, escalares, posicoes = colunas_para_arrays(df, n_qubits)
+        return cls(posicoes, escalares)
+
+    @classmethod
+    def from_csv(cls, caminho, n_qubits=None):
+        return cls.from_dataframe(pd.read_csv(caminho), n_qubits)
+
+    @classmethod
+    def from_bloco(cls, caminho):
+        # Memmap float32: as posições não são copiadas para a memória
+        bloco = carregar_bloco(caminho)
+        return cls(bloco.posicoes, bloco.escalares)
+
+    @classmethod
+    def from_path(cls, caminho):
+        return cls.from_bloco(caminho) if e_bloco(caminho) else cls.from_csv(caminho)
+
+    def meta(self):
+        return {'n_qubits': self.n_qubits, 'total_frames': self.total_frames,
+                'escalares': self.nomes_escalares}
+
+    def _mensagem(self, idx):
+        return empacotar_frame(idx, self.escalares[idx], self.posicoes[idx])
+
+    def primeiro_disponivel(self):
+        return 0
+
+    async def aguardar(self, idx):
+        """
+        Retorna True se o frame existe, False se o dataset terminou.
+        """
+        return 0 <= idx < self.total_frames
+
+class FonteGerador:
+    """
+    Fonte ao vivo alimentada por um gerador de (escalares, posicoes).
+    Mantém apenas os últimos `retencao` frames (memória limitada); clientes que
+    ficam para trás são reposicionados no frame mais antigo ainda retido.
+    """
+    def __init__(self, gerador, n_qubits, nomes_escalares=ESCALARES_PADRAO,
+                 retencao=4096, fps=0.0):
+        self.gerador = iter(gerador)
+        self.n_qubits = n_qubits
+        self.nomes_escalares = list(nomes_escalares)
+        self.total_frames = -1  # Ao vivo: desconhecido até o gerador esgotar
+        self.fps = fps
+        self._buffer = collections.deque(maxlen=retencao)
+        self._base = 0       # Índice do frame mais antigo retido
+        self._produzidos = 0
+        self._esgotado = False
+        self._novo = asyncio.Event()
+
+    def meta(self):
+        return {'n_qubits': self.n_qubits, 'total_frames': self.total_frames,
+                'escalares': self.nomes_escalares}
+
+    async def alimentar(self):
+        """
+        Task produtora: consome o gerador e publica frames já serializados.
+        """
+        intervalo = 1.0 / self.fps if self.fps > 0 else 0.0
+        for escalares, posicoes in self.gerador:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._base += 1
+            self._buffer.append(empacotar_frame(self._produzidos, escalares, posicoes))
+            self._produzidos += 1
+            self._novo.set()
+            self._novo = asyncio.Event()
+            # Cede o loop mesmo sem taxa (não bloqueia os clientes)
+            await asyncio.sleep(intervalo)
+        self._esgotado = True
+        self.total_frames = self._produzidos
+        self._novo.set()
+
+    def primeiro_disponivel(self):
+        return self._base
+
+    def mensagem(self, idx):
+        return self._buffer[idx - self._base]
+
+    async def aguardar(self, idx):
+        while idx >= self._produzidos:
+            if self._esgotado:
+                return False
+            await self._novo.wait()
+        return True
+
+class FonteProcedural:
+    """
+    Execução procedural sem dataset armazenado: os frames são calculados sob
+    demanda em blocos via `evaluate_frames` do engine (RNG por contador), então
+    qualquer cliente pode fazer seek para qualquer ponto da execução.
+    """
+    def __init__(self, engine, total_frames, bloco=256, cache_blocos=64):
+        self.engine = engine
+        self.total_frames = total_frames
+        self.n_qubits = engine.n_qubits
+        self.nomes_escalares = list(ESCALARES_PADRAO)
+        self.bloco = bloco
+        self.cache_blocos = cache_blocos
+        # Blocos prontos (LRU) e blocos em cálculo: um único futuro por bloco,
+        # compartilhado por todos os clientes que pedirem frames dele
+        self._blocos = collections.OrderedDict()
+        self._pendentes = {}
+
+    def meta(self):
+        return {'n_qubits': self.n_qubits, 'total_frames': self.total_frames,
+                'escalares': self.nomes_escalares}
+
+    def _avaliar_bloco(self, b):
+        ini = b * self.bloco
+        indices = np.arange(ini, min(ini + self.bloco, self.total_frames))
+        posicoes, escalares = self.engine.evaluate_frames(indices, self.total_frames)
+        return [empacotar_frame(idx, [escalares[k][i] for k in self.nomes_escalares], posicoes[i])
+                for i, idx in enumerate(indices)]
+
+    def _guardar_bloco(self, b, futuro):
+        self._pendentes.pop(b, None)
+        if futuro.cancelled() or futuro.exception() is not None:
+            return
+        self._blocos[b] = futuro.result()
+        while len(self._blocos) > self.cache_blocos:
+            self._blocos.popitem(last=False)
+
+    def mensagem(self, idx):
+        # Só lê o cache: aguardar() já garantiu o bloco
+        return self._blocos[idx // self.bloco][idx % self.bloco]
+
+    def primeiro_disponivel(self):
+        return 0
+
+    async def aguardar(self, idx):
+        """
+        Garante o bloco do frame no cache. evaluate_frames roda no executor
+        para não travar o laço de eventos (e os outros clientes) durante o cálculo.
+        """
+        if not 0 <= idx < self.total_frames:
+            return False
+        b = idx // self.bloco
+        # Em laço: o bloco pode ser despejado antes desta tarefa retomar
+        while b not in self._blocos:
+            futuro = self._pendentes.get(b)
+            if futuro is None:
+                futuro = asyncio.get_running_loop().run_in_executor(None, self._avaliar_bloco, b)
+                futuro.add_done_callback(functools.partial(self._guardar_bloco, b))
+                self._pendentes[b] = futuro
+            # shield: um cliente que desconecta não cancela o cálculo dos outros
+            await asyncio.shield(futuro)
+        self._blocos.move_to_end(b)
+        return True
+
+# ==================================================================================
+# MÓDULO III: CANAIS DE TRANSPORTE
+# ==================================================================================
+
+class _CanalTCP:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.endereco = writer.get_extra_info('peername')
+
+    async def enviar(self, mensagem):
+        self.writer.write(_enquadrar(mensagem))
+
+    def buffer_pendente(self):
+        return self.writer.transport.get_write_buffer_size()
+
+    def fechado(self):
+        return self.writer.is_closing()
+
+    async def drenar(self):
+        await self.writer.drain()
+
+    async def receber(self):
+        cabecalho = await self.reader.readexactly(_CABECALHO.size)
+        tamanho, tipo = _CABECALHO.unpack(cabecalho)
+        # O tamanho vem do cliente: sem limite, qualquer peer faria o servidor bufferizar 4 GB
+        if tamanho > TAMANHO_MAX_CONTROLE:
+            raise ErroProtocolo(f"Mensagem de controle com {tamanho} bytes")
+        return tipo, await self.reader.readexactly(tamanho)
+
+    def fechar(self):
+        self.writer.close()
+
+class _CanalWS:
+    def __init__(self, ws):
+        self.ws = ws
+        self.endereco = ws.remote_address
+
+    async def enviar(self, mensagem):
+        # O servidor só envia abaixo de `limite_alto` e o write_limit do websockets
+        # fica acima disso, então send() praticamente nunca bloqueia
+        await self.ws.send(mensagem)
+
+    def buffer_pendente(self):
+        return self.ws.transport.get_write_buffer_size()
+
+    def fechado(self):
+        return self.ws.transport.is_closing()
+
+    async def drenar(self):
+        while self.buffer_pendente() > 0 and not self.ws.transport.is_closing():
+            await asyncio.sleep(0.001)
+
+    async def receber(self):
+        mensagem = await self.ws.recv()
+        # Frames de texto (str) ou vazios não pertencem ao protocolo binário
+        if not isinstance(mensagem, bytes) or not mensagem:
+            raise ErroProtocolo("Frame WebSocket vazio ou de texto")
+        return mensagem[0], mensagem[1:]
+
+    def fechar(self):
+        asyncio.ensure_future(self.ws.close())
+
+# ==================================================================================
+# MÓDULO IV: SERVIDOR (FAN-OUT)
+# ==================================================================================
+
+class _SessaoCliente:
+    """
+    Estado por cliente: cursor (seek), taxa (rate) e contadores de descarte.
+    """
+    def __init__(self, canal, fonte):
+        self.canal = canal
+        self.fonte = fonte
+        self.cursor = fonte.primeiro_disponivel()
+        self.fps = 0.0
+        self.enviados = 0
+        self.descartados = 0
+        self.desconectado_lento = False
+        self.encerrada = False
+        self._mudou = asyncio.Event()
+
+    def controle(self, tipo, payload):
+        if tipo == MSG_INICIO:
+            inicio, fps = _INICIO.unpack(payload)
+            if inicio >= 0:
+                self.cursor = max(inicio, self.fonte.primeiro_disponivel())
+            self.fps = max(fps, 0.0)
+        elif tipo == MSG_SEEK:
+            self.cursor = max(_SEEK.unpack(payload)[0], self.fonte.primeiro_disponivel())
+        elif tipo == MSG_RATE:
+            self.fps = max(_RATE.unpack(payload)[0], 0.0)
+        self._mudou.set()
+
+class Harpia_Stream_Server:
+    """
+    Servidor de frames. Cada cliente tem cursor e taxa próprios; os bytes de
+    cada frame são serializados uma única vez e compartilhados entre clientes.
+
+    Backpressure:
+      - fps > 0 (tempo real): com o buffer de escrita acima de `limite_alto`
+        o frame é descartado e o cursor segue o relógio.
+      - fps = 0 (bulk): aguarda o drain sem perdas.
+      - Cliente acima do limite por mais de `tempo_max_lento` segundos é
+        desconectado (slow-client dropping).
+    """
+    def __init__(self, fonte, limite_alto=1 << 20, tempo_max_lento=5.0):
+        self.fonte = fonte
+        self.limite_alto = limite_alto
+        self.tempo_max_lento = tempo_max_lento
+        self.sessoes = set()
+        self._tarefas = set()
+        self.stats = {'clientes': 0, 'frames_enviados': 0, 'frames_descartados': 0,
+                      'bytes_enviados': 0, 'clientes_lentos': 0}
+        self._servidores = []
+
+    async def iniciar_tcp(self, host='127.0.0.1', porta=8765):
+        servidor = await asyncio.start_server(self._conexao_tcp, host, porta)
+        self._servidores.append(servidor)
+        return servidor.sockets[0].getsockname()[1]
+
+    async def iniciar_ws(self, host='127.0.0.1', porta=8766):
+        if not WEBSOCKETS_AVAILABLE:
+            raise RuntimeError("'websockets' não instalado: pip install websockets")
+        servidor = await websockets.serve(self._conexao_ws, host, porta,
+                                          max_size=1 + TAMANHO_MAX_CONTROLE,
+                                          write_limit=2 * self.limite_alto)
+        self._servidores.append(servidor)
+        return list(servidor.sockets)[0].getsockname()[1]
+
+    async def fechar(self):
+        for servidor in self._servidores:
+            servidor.close()
+        # Encerra as sessões abertas antes de aguardar os servidores
+        for sessao in list(self.sessoes):
+            sessao.encerrada = True
+            sessao._mudou.set()
+            sessao.canal.fechar()
+        if self._tarefas:
+            await asyncio.wait(list(self._tarefas))
+        for servidor in self._servidores:
+            await servidor.wait_closed()
+        self._servidores.clear()
+
+    async def _conexao_tcp(self, reader, writer):
+        await self._atender(_CanalTCP(reader, writer))
+
+    async def _conexao_ws(self, ws):
+        await self._atender(_CanalWS(ws))
+
+    async def _atender(self, canal):
+        sessao = _SessaoCliente(canal, self.fonte)
+        self.sessoes.add(sessao)
+        self._tarefas.add(asyncio.current_task())
+        self.stats['clientes'] += 1
+        controle = None
+        try:
+            await canal.enviar(bytes([MSG_META]) + json.dumps(self.fonte.meta()).encode('utf-8'))
+            tipo, payload = await asyncio.wait_for(canal.receber(), self.tempo_max_lento)
+            if tipo != MSG_INICIO:
+                return
+            sessao.controle(tipo, payload)
+            controle = asyncio.ensure_future(self._laco_controle(sessao))
+            await self._laco_envio(sessao)
+        except (*_ERROS_CONEXAO, asyncio.TimeoutError, struct.error, ErroProtocolo):
+            pass
+        finally:
+            if controle is not None:
+                controle.cancel()
+            self._tarefas.discard(asyncio.current_task())
+            self.sessoes.discard(sessao)
+            self.stats['frames_enviados'] += sessao.enviados
+            self.stats['frames_descartados'] += sessao.descartados
+            canal.fechar()
+
+    async def _laco_controle(self, sessao):
+        try:
+            while True:
+                tipo, payload = await sessao.canal.receber()
+                sessao.controle(tipo, payload)
+        except (*_ERROS_CONEXAO, struct.error, ErroProtocolo):
+            # Cliente desconectou (ou enviou lixo): encerra o laço de envio
+            sessao.encerrada = True
+            sessao._mudou.set()
+
+    async def _laco_envio(self, sessao):
+        canal = sessao.canal
+        inicio_lento = None
+        proximo = time.perf_counter()
+        while not sessao.encerrada and not canal.fechado():
+            sessao._mudou.clear()
+            if not await self.fonte.aguardar(sessao.cursor):
+                await canal.enviar(bytes([MSG_FIM]))
+                await canal.drenar()
+                # Aguarda um SEEK para reiniciar (ou o fechamento da conexão)
+                await sessao._mudou.wait()
+                continue
+
+            # Cliente ficou para trás da janela retida (fonte ao vivo)
+            base = self.fonte.primeiro_disponivel()
+            if sessao.cursor < base:
+                sessao.descartados += base - sessao.cursor
+                sessao.cursor = base
+
+            if canal.buffer_pendente() > self.limite_alto:
+                agora = time.perf_counter()
+                inicio_lento = inicio_lento or agora
+                if agora - inicio_lento > self.tempo_max_lento:
+                    sessao.desconectado_lento = True
+                    self.stats['clientes_lentos'] += 1
+                    return
+                if sessao.fps > 0:
+                    # Tempo real: descarta e segue o relógio
+                    sessao.descartados += 1
+                    sessao.cursor += 1
+                    proximo += 1.0 / sessao.fps
+                    await asyncio.sleep(max(0.0, proximo - time.perf_counter()))
+                else:
+                    # Bulk: espera o drain, mas com limite para detectar cliente lento
+                    try:
+                        await asyncio.wait_for(canal.drenar(), self.tempo_max_lento)
+                    except asyncio.TimeoutError:
+                        pass
+                continue
+            inicio_lento = None
+
+            mensagem = self.fonte.mensagem(sessao.cursor)
+            await canal.enviar(mensagem)
+            sessao.enviados += 1
+            self.stats['bytes_enviados'] += len(mensagem)
+            sessao.cursor += 1
+
+            if sessao.fps > 0:
+                proximo = max(proximo + 1.0 / sessao.fps, time.perf_counter() - 1.0)
+                espera = proximo - time.perf_counter()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+            elif sessao.enviados % 64 == 0:
+                await asyncio.sleep(0)
+
+# ==================================================================================
+# MÓDULO V: CLIENTE (MODO DE FONTE DE REDE DOS PLAYERS)
+# ==================================================================================
+
+class Harpia_Stream_Client:
+    """
+    Cliente asyncio TCP. Itere com `async for idx, escalares, posicoes in cliente`.
+    """
+    def __init__(self, reader, writer, meta):
+        self.reader = reader
+        self.writer = writer
+        self.meta = meta
+        self.n_qubits = meta['n_qubits']
+        self.nomes_escalares = meta['escalares']
+
+    @classmethod
+    async def conectar(cls, host='127.0.0.1', porta=8765, fps=0.0, inicio=None):
+        reader, writer = await asyncio.open_connection(host, porta)
+        tamanho, tipo = _CABECALHO.unpack(await reader.readexactly(_CABECALHO.size))
+        payload = await reader.readexactly(tamanho)
+        if tipo != MSG_META:
+            writer.close()
+            raise ConnectionError(f"Handshake inválido (tipo {tipo:#x})")
+        cliente = cls(reader, writer, json.loads(payload.decode('utf-8')))
+        inicio = -1 if inicio is None else int(inicio)
+        writer.write(_enquadrar(bytes([MSG_INICIO]) + _INICIO.pack(inicio, float(fps))))
+        return cliente
+
+    def seek(self, frame):
+        self.writer.write(_enquadrar(bytes([MSG_SEEK]) + _SEEK.pack(int(frame))))
+
+    def rate(self, fps):
+        self.writer.write(_enquadrar(bytes([MSG_RATE]) + _RATE.pack(float(fps))))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            tamanho, tipo = _CABECALHO.unpack(await self.reader.readexactly(_CABECALHO.size))
+            payload = await self.reader.readexactly(tamanho)
+        except asyncio.IncompleteReadError:
+            raise StopAsyncIteration
+        if tipo == MSG_FIM:
+            raise StopAsyncIteration
+        return desempacotar_frame(payload, len(self.nomes_escalares), self.n_qubits)
+
+    def fechar(self):
+        self.writer.close()
+
+def _parse_url(url):
+    # tcp://host:porta[?inicio=N&frames=M]
+    endereco, _, consulta = url.split('://', 1)[1].partition('?')
+    host, _, porta = endereco.rpartition(':')
+    params = dict(p.split('=', 1) for p in consulta.split('&') if '=' in p)
+    return host or '127.0.0.1', int(porta), params
+
+async def _receber_dataset(url, max_frames=None):
+    host, porta, params = _parse_url(url)
+    max_frames = max_frames or (int(params['frames']) if 'frames' in params else None)
+    inicio = int(params['inicio']) if 'inicio' in params else None
+    cliente = await Harpia_Stream_Client.conectar(host, porta, inicio=inicio)
+    total = cliente.meta['total_frames']
+    if total < 0:
+        # Fonte ao vivo não tem fim conhecido: sem limite explícito não há como dimensionar
+        if max_frames is None:
+            cliente.fechar()
+            raise ValueError("Fonte ao vivo: informe max_frames (ou ?frames=N na URL)")
+        n = max_frames
+    else:
+        # Só os frames a partir de `inicio` chegam: dimensiona pelo restante
+        n = max(total - max(inicio or 0, 0), 0)
+        n = min(n, max_frames) if max_frames is not None else n
+
+    frames = np.zeros(n, dtype=np.int64)
+    escalares = np.zeros((n, len(cliente.nomes_escalares)))
+    # f32 é o formato do fio: sem ganho em guardar f64
+    posicoes = np.zeros((n, cliente.n_qubits, 3), dtype=np.float32)
+    if n == 0:
+        cliente.fechar()
+        return frames, dict(zip(cliente.nomes_escalares, escalares.T)), posicoes
+    i = 0
+    async for idx, esc, pos in cliente:
+        frames[i], escalares[i], posicoes[i] = idx, esc, pos
+        i += 1
+        if i == n:
+            break
+    cliente.fechar()
+    return frames[:i], dict(zip(cliente.nomes_escalares, escalares[:i].T)), posicoes[:i]
+
+def receber_stream(url, max_frames=None):
+    """
+    Fonte de rede em arrays: (frames, escalares, posicoes [frames, qubits, 3]).
+    """
+    return asyncio.run(_receber_dataset(url, max_frames))
+
+def ler_stream(url, max_frames=None):
+    """
+    Substituto de `pd.read_csv` para a fonte de rede: devolve um DataFrame com
+    as mesmas colunas do CSV do gerador (Frame, escalares, q{i}_x/y/z).
+    """
+    frames, escalares, posicoes = receber_stream(url, max_frames)
+    data_dict = {'Frame': frames}
+    data_dict.update(escalares)
+    for i in range(posicoes.shape[1]):
+        data_dict[f'q{i}_x'] = posicoes[:, i, 0]
+        data_dict[f'q{i}_y'] = posicoes[:, i, 1]
+        data_dict[f'q{i}_z'] = posicoes[:, i, 2]
+    return pd.DataFrame(data_dict)
+
+def carregar_telemetria(origem, n_qubits=None):
+    """
+    Leitura dos players: `tcp://host:porta` ou caminho de CSV, devolvendo
+    (frames, escalares, posicoes [frames, qubits, 3]) sem DataFrame intermediário
+    na fonte de rede. Datasets em bloco (.harpia) são abertos com `carregar_bloco`.
+    """
+    if origem.startswith('tcp://'):
+        frames, escalares, posicoes = receber_stream(origem)
+        return frames, escalares, posicoes[:, :n_qubits]
+    return colunas_para_arrays(pd.read_csv(origem), n_qubits)
+
+# ==================================================================================
+# MÓDULO VI: BENCHMARK DE FAN-OUT (LOOPBACK)
+# ==================================================================================
+
+async def medir_fanout(n_clientes=64, total_frames=5000, n_qubits=8, fps=0.0):
+    """
+    Sobe o servidor em 127.0.0.1 e conecta `n_clientes` simulados em paralelo.
+    """
+    posicoes = np.random.uniform(-20, 20, size=(total_frames, n_qubits, 3))
+    escalares = {k: np.random.uniform(0, 1, total_frames) for k in ESCALARES_PADRAO}
+    servidor = Harpia_Stream_Server(FonteDataset(posicoes, escalares))
+    porta = await servidor.iniciar_tcp('127.0.0.1', 0)
+
+    async def simular_cliente():
+        cliente = await Harpia_Stream_Client.conectar('127.0.0.1', porta, fps=fps)
+        recebidos = 0
+        async for _ in cliente:
+            recebidos += 1
+        cliente.fechar()
+        return recebidos
+
+    inicio = time.perf_counter()
+    recebidos = await asyncio.gather(*[simular_cliente() for _ in range(n_clientes)])
+    dt = time.perf_counter() - inicio
+    await servidor.fechar()
+
+    total = sum(recebidos)
+    return {
+        'clientes': n_clientes,
+        'frames_recebidos': total,
+        'frames_por_cliente_min': min(recebidos),
+        'frames_descartados': servidor.stats['frames_descartados'],
+        'segundos': dt,
+        'frames_por_segundo': total / dt,
+        'mb_por_segundo': servidor.stats['bytes_enviados'] / dt / 1e6,
+    }
+
+async def _servir(caminho, porta_tcp, porta_ws):
+    fonte = FonteDataset.from_path(caminho)
+    servidor = Harpia_Stream_Server(fonte)
+    porta = await servidor.iniciar_tcp('0.0.0.0', porta_tcp)
+    print(f"📡 TCP: tcp://0.0.0.0:{porta} ({fonte.total_frames} frames, {fonte.n_qubits} qubits)")
+    if WEBSOCKETS_AVAILABLE:
+        porta = await servidor.iniciar_ws('0.0.0.0', porta_ws)
+        print(f"🌐 WebSocket: ws://0.0.0.0:{porta}")
+    await asyncio.Event().wait()
+
+ENGINES_PROCEDURAIS = {
+    'cubo': ('sphy_harpia_geometry_n1_pl', 'Harpia_Geometry_Engine_Turbo'),
+    'piramide': ('sphy_harpia_geometry_pyramid', 'Harpia_Pyramid_Engine'),
+}
+
+async def _servir_procedural(nome, total_frames, semente, porta_tcp):
+    import importlib
+    modulo, classe = ENGINES_PROCEDURAIS[nome]
+    engine = getattr(importlib.import_module(modulo), classe)(semente)
+    servidor = Harpia_Stream_Server(FonteProcedural(engine, total_frames))
+    porta = await servidor.iniciar_tcp('0.0.0.0', porta_tcp)
+    print(f"📡 TCP: tcp://0.0.0.0:{porta} ({nome} procedural, {total_frames} frames, "
+          f"semente {engine.semente})")
+    await asyncio.Event().wait()
+
+if __name__ == "__main__":
+    # Uso:
+    #   python sphy_harpia_stream_server.py serve dataset.csv|dataset.harpia [porta_tcp] [porta_ws]
+    #   python sphy_harpia_stream_server.py procedural cubo|piramide frames [semente] [porta_tcp]
+    #   python sphy_harpia_stream_server.py bench [clientes] [frames]
+    if len(sys.argv) >= 2 and sys.argv[1] == 'bench':
+        n_clientes = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+        total_frames = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+        print(f"🚀 Fan-out loopback: {n_clientes} clientes x {total_frames} frames...")
+        r = asyncio.run(medir_fanout(n_clientes, total_frames))
+        print(f"📦 Frames recebidos: {r['frames_recebidos']} (mín/cliente: {r['frames_por_cliente_min']})")
+        print(f"⚡ Throughput: {r['frames_por_segundo']:.0f} frames/s | {r['mb_por_segundo']:.1f} MB/s")
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'serve':
+        porta_tcp = int(sys.argv[3]) if len(sys.argv) > 3 else 8765
+        porta_ws = int(sys.argv[4]) if len(sys.argv) > 4 else 8766
+        try:
+            asyncio.run(_servir(sys.argv[2], porta_tcp, porta_ws))
+        except KeyboardInterrupt:
+            print("\n🛑 Servidor encerrado.")
+    elif len(sys.argv) >= 4 and sys.argv[1] == 'procedural':
+        semente = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        porta_tcp = int(sys.argv[5]) if len(sys.argv) > 5 else 8765
+        try:
+            asyncio.run(_servir_procedural(sys.argv[2], int(sys.argv[3]), semente, porta_tcp))
+        except KeyboardInterrupt:
+            print("\n🛑 Servidor encerrado.")
+    else:
+        print("Uso: serve <dataset.csv> [porta_tcp] [porta_ws] | "
+              "procedural <cubo|piramide> <frames> [semente] [porta_tcp] | bench [clientes] [frames]")